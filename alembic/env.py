@@ -1,5 +1,6 @@
 import asyncio
 import os
+import re
 import sys
 from logging.config import fileConfig
 from typing import cast
@@ -16,9 +17,14 @@ from hermanitto_docs_api.core.config import settings
 from hermanitto_docs_api.models.user import Base
 from hermanitto_docs_api.models.document import Document
 from hermanitto_docs_api.models.document_type import DocumentType
+from hermanitto_docs_api.models.document_type_count import DocumentTypeCount
 
 config = context.config
 
+# Partições de documents e documents_archive (PostgreSQL): criadas pela
+# migração e por services/archive_service.py, fora dos modelos
+PARTITION_TABLE = re.compile(r"documents_p\d{6}|documents(_archive)?_default")
+
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
@@ -28,6 +34,18 @@ config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 target_metadata = Base.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    # documents_fts (e suas tabelas internas) é mantida por DDL própria;
+    # o índice de trigramas só existe no PostgreSQL
+    if type_ == "table" and name.startswith("documents_fts"):
+        return False
+    if type_ == "table" and PARTITION_TABLE.fullmatch(name):
+        return False
+    if type_ == "index" and name == "ix_documents_link_trgm":
+        return context.get_bind().dialect.name == "postgresql"
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = cast(str, config.get_main_option("sqlalchemy.url"))
@@ -47,6 +65,7 @@ def do_run_migrations(connection) -> None:
         connection=connection,
         target_metadata=target_metadata,
         compare_type=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
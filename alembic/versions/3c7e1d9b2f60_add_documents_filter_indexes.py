@@ -0,0 +1,40 @@
+"""add documents filter indexes
+
+Revision ID: 3c7e1d9b2f60
+Revises: af16829a5047
+Create Date: 2026-10-18 11:02:17.584102
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c7e1d9b2f60"
+down_revision: Union[str, None] = "af16829a5047"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_documents_type_id_created_at_id",
+        "documents",
+        ["type_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_documents_updated_at_id",
+        "documents",
+        ["updated_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_documents_updated_at_id", table_name="documents")
+    op.drop_index(
+        "ix_documents_type_id_created_at_id", table_name="documents"
+    )
@@ -0,0 +1,204 @@
+"""partition documents by month
+
+Revision ID: 4f8a2d6c9e15
+Revises: e2a6f4c81b37
+Create Date: 2026-10-18 17:02:44.581907
+
+"""
+
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "4f8a2d6c9e15"
+down_revision: Union[str, None] = "e2a6f4c81b37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    "id, type_id, link, created_at, updated_at, "
+    "link_status, link_latency_ms, link_error, last_checked_at"
+)
+INDEXES = (
+    ("ix_documents_id", ["id"]),
+    ("ix_documents_created_at_id", ["created_at", "id"]),
+    ("ix_documents_type_id_created_at_id", ["type_id", "created_at", "id"]),
+    ("ix_documents_updated_at_id", ["updated_at", "id"]),
+)
+# Partições criadas adiante do mês corrente; as seguintes ficam com
+# services/archive_service.ensure_partitions
+MONTHS_AHEAD = 3
+
+
+def _columns(id_default=None) -> list[sa.Column]:
+    return [
+        sa.Column(
+            "id", sa.Integer(), server_default=id_default, nullable=False
+        ),
+        sa.Column("type_id", sa.Integer(), nullable=False),
+        sa.Column("link", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("link_status", sa.Integer(), nullable=True),
+        sa.Column("link_latency_ms", sa.Float(), nullable=True),
+        sa.Column("link_error", sa.String(length=255), nullable=True),
+        sa.Column("last_checked_at", sa.DateTime(), nullable=True),
+    ]
+
+
+def _month_start(moment: datetime) -> datetime:
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _months(first: datetime, last: datetime):
+    month = _month_start(first)
+    while month <= last:
+        end = _add_months(month, 1)
+        yield f"documents_p{month:%Y%m}", month, end
+        month = end
+
+
+def _create_documents_indexes():
+    for name, columns in INDEXES:
+        op.create_index(name, "documents", columns, unique=False)
+    op.create_index(
+        "ix_documents_link_trgm",
+        "documents",
+        ["link"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"link": "gin_trgm_ops"},
+    )
+
+
+def _drop_documents_indexes(table: str):
+    op.drop_index("ix_documents_link_trgm", table_name=table)
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name=table)
+
+
+def _recount_documents():
+    op.execute("DELETE FROM document_type_counts")
+    op.execute(
+        "INSERT INTO document_type_counts (type_id, document_count) "
+        "SELECT type_id, COUNT(*) FROM documents GROUP BY type_id"
+    )
+
+
+def _upgrade_postgresql():
+    # Recria documents particionada por RANGE (created_at) e copia as
+    # linhas uma vez. A chave primária passa a (id, created_at): toda
+    # restrição única precisa incluir a chave de partição.
+    op.execute("ALTER TABLE documents RENAME TO documents_unpartitioned")
+    op.execute(
+        "ALTER TABLE documents_unpartitioned "
+        "RENAME CONSTRAINT documents_pkey TO documents_unpartitioned_pkey"
+    )
+    _drop_documents_indexes("documents_unpartitioned")
+    op.create_table(
+        "documents",
+        *_columns(sa.text("nextval('documents_id_seq'::regclass)")),
+        sa.ForeignKeyConstraint(["type_id"], ["document_types.id"]),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.execute("ALTER SEQUENCE documents_id_seq OWNED BY documents.id")
+    op.execute("CREATE TABLE documents_default PARTITION OF documents DEFAULT")
+    current = _month_start(datetime.utcnow())
+    oldest = op.get_bind().scalar(
+        sa.text("SELECT min(created_at) FROM documents_unpartitioned")
+    )
+    for name, start, end in _months(
+        min(oldest or current, current), _add_months(current, MONTHS_AHEAD)
+    ):
+        op.execute(
+            f"CREATE TABLE {name} PARTITION OF documents FOR VALUES "
+            f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    op.execute(
+        f"INSERT INTO documents ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM documents_unpartitioned"
+    )
+    op.drop_table("documents_unpartitioned")
+    # Índices depois da carga; criados no pai, valem para cada partição
+    _create_documents_indexes()
+
+    op.create_table(
+        "documents_archive",
+        *_columns(),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.execute(
+        "CREATE TABLE documents_archive_default "
+        "PARTITION OF documents_archive DEFAULT"
+    )
+
+
+def _downgrade_postgresql():
+    # Volta a uma tabela só, com as linhas ativas e as arquivadas
+    op.execute("ALTER TABLE documents RENAME TO documents_partitioned")
+    op.execute(
+        "ALTER TABLE documents_partitioned "
+        "RENAME CONSTRAINT documents_pkey TO documents_partitioned_pkey"
+    )
+    _drop_documents_indexes("documents_partitioned")
+    op.create_table(
+        "documents",
+        *_columns(sa.text("nextval('documents_id_seq'::regclass)")),
+        sa.ForeignKeyConstraint(["type_id"], ["document_types.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute("ALTER SEQUENCE documents_id_seq OWNED BY documents.id")
+    op.execute(
+        f"INSERT INTO documents ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM documents_partitioned "
+        f"UNION ALL SELECT {COLUMNS} FROM documents_archive"
+    )
+    # Remover o pai remove as partições (inclusive as arquivadas)
+    op.drop_table("documents_archive")
+    op.drop_table("documents_partitioned")
+    _create_documents_indexes()
+    _recount_documents()
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        _upgrade_postgresql()
+    else:
+        # Sem particionamento: o arquivamento move as linhas em lotes
+        op.create_table(
+            "documents_archive",
+            *_columns(),
+            sa.PrimaryKeyConstraint("id", "created_at"),
+        )
+    op.create_index(
+        "ix_documents_archive_created_at_id",
+        "documents_archive",
+        ["created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        _downgrade_postgresql()
+    else:
+        op.execute(
+            f"INSERT INTO documents ({COLUMNS}) "
+            f"SELECT {COLUMNS} FROM documents_archive"
+        )
+        op.drop_index(
+            "ix_documents_archive_created_at_id",
+            table_name="documents_archive",
+        )
+        op.drop_table("documents_archive")
+        _recount_documents()
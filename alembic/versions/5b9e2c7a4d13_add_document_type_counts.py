@@ -0,0 +1,41 @@
+"""add document type counts
+
+Revision ID: 5b9e2c7a4d13
+Revises: 8d41b7e0c2a9
+Create Date: 2026-10-18 14:08:31.772045
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b9e2c7a4d13"
+down_revision: Union[str, None] = "8d41b7e0c2a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_type_counts",
+        sa.Column("type_id", sa.Integer(), nullable=False),
+        sa.Column("document_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["type_id"],
+            ["document_types.id"],
+        ),
+        sa.PrimaryKeyConstraint("type_id"),
+    )
+    # Contagem inicial a partir dos documentos existentes
+    op.execute(
+        "INSERT INTO document_type_counts (type_id, document_count) "
+        "SELECT type_id, COUNT(*) FROM documents GROUP BY type_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("document_type_counts")
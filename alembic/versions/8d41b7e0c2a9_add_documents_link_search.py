@@ -0,0 +1,70 @@
+"""add documents link search
+
+Revision ID: 8d41b7e0c2a9
+Revises: 3c7e1d9b2f60
+Create Date: 2026-10-18 12:26:54.310977
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d41b7e0c2a9"
+down_revision: Union[str, None] = "3c7e1d9b2f60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE documents_fts USING fts5("
+    "link, content='documents', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER documents_fts_ai AFTER INSERT ON documents BEGIN "
+    "INSERT INTO documents_fts(rowid, link) VALUES (new.id, new.link); "
+    "END",
+    "CREATE TRIGGER documents_fts_ad AFTER DELETE ON documents BEGIN "
+    "INSERT INTO documents_fts(documents_fts, rowid, link) "
+    "VALUES ('delete', old.id, old.link); "
+    "END",
+    "CREATE TRIGGER documents_fts_au AFTER UPDATE OF link ON documents "
+    "BEGIN "
+    "INSERT INTO documents_fts(documents_fts, rowid, link) "
+    "VALUES ('delete', old.id, old.link); "
+    "INSERT INTO documents_fts(rowid, link) VALUES (new.id, new.link); "
+    "END",
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            "ix_documents_link_trgm",
+            "documents",
+            ["link"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"link": "gin_trgm_ops"},
+        )
+    elif dialect == "sqlite":
+        for statement in SQLITE_FTS_DDL:
+            op.execute(statement)
+        # Indexa as linhas já existentes
+        op.execute(
+            "INSERT INTO documents_fts(documents_fts) VALUES ('rebuild')"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.drop_index("ix_documents_link_trgm", table_name="documents")
+    elif dialect == "sqlite":
+        for trigger in (
+            "documents_fts_ai",
+            "documents_fts_ad",
+            "documents_fts_au",
+        ):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS documents_fts")
@@ -0,0 +1,31 @@
+"""add documents keyset index
+
+Revision ID: af16829a5047
+Revises: a5695e65e6d9
+Create Date: 2026-10-18 09:12:41.203518
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "af16829a5047"
+down_revision: Union[str, None] = "a5695e65e6d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_documents_created_at_id",
+        "documents",
+        ["created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_documents_created_at_id", table_name="documents")
@@ -0,0 +1,43 @@
+"""add documents link check
+
+Revision ID: e2a6f4c81b37
+Revises: 5b9e2c7a4d13
+Create Date: 2026-10-18 15:47:09.118562
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2a6f4c81b37"
+down_revision: Union[str, None] = "5b9e2c7a4d13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "documents", sa.Column("link_status", sa.Integer(), nullable=True)
+    )
+    op.add_column(
+        "documents", sa.Column("link_latency_ms", sa.Float(), nullable=True)
+    )
+    op.add_column(
+        "documents",
+        sa.Column("link_error", sa.String(length=255), nullable=True),
+    )
+    op.add_column(
+        "documents",
+        sa.Column("last_checked_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("documents", "last_checked_at")
+    op.drop_column("documents", "link_error")
+    op.drop_column("documents", "link_latency_ms")
+    op.drop_column("documents", "link_status")
@@ -0,0 +1,131 @@
+import statistics
+import tempfile
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from hermanitto_docs_api.core.config import settings
+from hermanitto_docs_api.core.dependencies import (
+    enable_sqlite_foreign_keys,
+    engine_options,
+    get_db,
+    get_read_db,
+    get_session_factory,
+)
+from hermanitto_docs_api.core.query_stats import instrument_engine
+from hermanitto_docs_api.main import app
+from hermanitto_docs_api.models.base import Base
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summarize(latencies: list[float], wall_seconds: float) -> dict:
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / wall_seconds, 2),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3),
+    }
+
+
+@asynccontextmanager
+async def bench_app(database_url: str | None = None, reset: bool = True):
+    """Yield (client, sessionmaker) for the app running in-process.
+
+    Without `database_url` a throwaway SQLite file is used. Tables are
+    dropped and recreated when `reset` is true.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        url = database_url or f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        engine = create_async_engine(url, **engine_options(url))
+        instrument_engine(engine)
+        enable_sqlite_foreign_keys(engine)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+        async def override_get_db():
+            async with sessions() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_db
+        # Os cenários de login medem o bcrypt: sem limite de tentativas
+        limits = (
+            settings.LOGIN_RATE_LIMIT_PER_USER,
+            settings.LOGIN_RATE_LIMIT_PER_IP,
+        )
+        settings.LOGIN_RATE_LIMIT_PER_USER = (
+            settings.LOGIN_RATE_LIMIT_PER_IP
+        ) = 0
+        app.dependency_overrides[get_session_factory] = lambda: sessions
+        if reset:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+                await conn.run_sync(Base.metadata.create_all)
+        try:
+            transport = ASGITransport(app=app)
+            async with AsyncClient(
+                transport=transport, base_url="http://bench"
+            ) as client:
+                yield client, sessions
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            app.dependency_overrides.pop(get_read_db, None)
+            app.dependency_overrides.pop(get_session_factory, None)
+            (
+                settings.LOGIN_RATE_LIMIT_PER_USER,
+                settings.LOGIN_RATE_LIMIT_PER_IP,
+            ) = limits
+            await engine.dispose()
+
+
+class _LinkStubHandler(BaseHTTPRequestHandler):
+    # Responde 200 sem corpo a qualquer HEAD/GET
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_GET = do_HEAD
+
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def link_stub():
+    """Yield the base URL of a local HTTP server for document links.
+
+    The link-check scenarios then never leave the machine. Private
+    addresses are allowed to the sweep while the stub runs.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _LinkStubHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    allow_private = settings.LINK_CHECK_ALLOW_PRIVATE
+    settings.LINK_CHECK_ALLOW_PRIVATE = True
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        settings.LINK_CHECK_ALLOW_PRIVATE = allow_private
+        server.shutdown()
+        server.server_close()
+
+
+def backend_name(database_url: str | None) -> str:
+    if not database_url:
+        return "sqlite"
+    return make_url(database_url).get_backend_name()
@@ -0,0 +1,73 @@
+"""Compare two benchmark reports written by benchmarks.run.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 0.15
+
+A route regresses when its p95 latency grows, or its requests/sec drops,
+by more than `--threshold` (a fraction). The exit status is 1 when any
+route regressed, so the command can gate CI.
+"""
+
+import argparse
+import json
+import sys
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> list[dict]:
+    rows = []
+    for route, new in candidate["routes"].items():
+        old = baseline["routes"].get(route)
+        if old is None:
+            continue
+        p95_change = new["p95_ms"] / old["p95_ms"] - 1 if old["p95_ms"] else 0
+        rps_change = new["rps"] / old["rps"] - 1 if old["rps"] else 0
+        rows.append(
+            {
+                "route": route,
+                "p95_ms": (old["p95_ms"], new["p95_ms"]),
+                "rps": (old["rps"], new["rps"]),
+                "p95_change": p95_change,
+                "rps_change": rps_change,
+                "regressed": p95_change > threshold or rps_change < -threshold,
+            }
+        )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    for key in ("database", "documents", "concurrency", "requests"):
+        if baseline["meta"].get(key) != candidate["meta"].get(key):
+            print(
+                f"warning: runs differ in {key}: "
+                f"{baseline['meta'].get(key)} != {candidate['meta'].get(key)}",
+                file=sys.stderr,
+            )
+
+    rows = compare(baseline, candidate, args.threshold)
+    print(
+        f"{'route':<34} {'p95 ms (old -> new)':>26} {'rps (old -> new)':>24}"
+    )
+    for row in rows:
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(
+            f"{row['route']:<34} "
+            f"{row['p95_ms'][0]:>9.2f} -> {row['p95_ms'][1]:>9.2f} "
+            f"({row['p95_change']:+6.1%}) "
+            f"{row['rps'][0]:>8.1f} -> {row['rps'][1]:>8.1f} "
+            f"({row['rps_change']:+6.1%}){flag}"
+        )
+    sys.exit(1 if any(row["regressed"] for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
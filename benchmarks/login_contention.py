@@ -0,0 +1,83 @@
+"""Latency of an unrelated endpoint while logins hammer bcrypt.
+
+Runs the app in-process (httpx + ASGITransport) on a temporary SQLite
+database. A probe client polls GET /api/v1/types/ while `--logins`
+concurrent clients log in continuously, and the probe's p50/p99 is
+reported. `--blocking` restores the old behaviour (bcrypt on the event
+loop) for comparison.
+
+    python -m benchmarks.login_contention --logins 8 --duration 5
+    python -m benchmarks.login_contention --logins 8 --duration 5 --blocking
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import bench_app, summarize
+from hermanitto_docs_api.core import security
+from hermanitto_docs_api.services import user_service
+
+
+async def _blocking_verify(plain_password, hashed_password):
+    return security.pwd_context.verify_and_update(
+        plain_password, hashed_password
+    )
+
+
+async def run(logins: int, duration: float, blocking: bool) -> dict:
+    if blocking:
+        user_service.verify_and_update_password_async = _blocking_verify
+
+    async with bench_app() as (client, _):
+        credentials = {"username": "bench", "password": "bench-pass"}
+        await client.post("/api/v1/users/register", json=credentials)
+        token = security.create_access_token({"sub": "bench"})
+        headers = {"Authorization": f"Bearer {token}"}
+        deadline = time.perf_counter() + duration
+        probe_latencies: list[float] = []
+        login_count = 0
+
+        async def login_loop():
+            nonlocal login_count
+            while time.perf_counter() < deadline:
+                await client.post("/api/v1/users/login", json=credentials)
+                login_count += 1
+
+        async def probe_loop():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.get("/api/v1/types/", headers=headers)
+                probe_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(
+            probe_loop(), *(login_loop() for _ in range(logins))
+        )
+
+    probe = summarize(probe_latencies, duration)
+    return {
+        "mode": "blocking" if blocking else "executor",
+        "concurrent_logins": logins,
+        "duration_s": duration,
+        "logins_completed": login_count,
+        "probe_requests": probe["requests"],
+        "probe_p50_ms": probe["p50_ms"],
+        "probe_p99_ms": probe["p99_ms"],
+        "probe_max_ms": probe["max_ms"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--blocking", action="store_true")
+    args = parser.parse_args()
+    report = asyncio.run(run(args.logins, args.duration, args.blocking))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
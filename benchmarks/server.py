@@ -0,0 +1,114 @@
+"""Load-test a running server over real HTTP.
+
+    python -m benchmarks.server --url http://127.0.0.1:8000 \\
+        --path /healthz --path /api/v1/types/ --requests 5000
+
+Unlike benchmarks.run, the requests cross the network stack and the HTTP
+server, so this compares serving setups (event loop, HTTP parser,
+workers) rather than application code. Authenticated paths get a token
+for --user signed with the local SECRET_KEY.
+
+The client is a minimal HTTP/1.1 keep-alive loop over raw sockets (one
+connection per --concurrency), so that on a small machine it does not
+eat the CPU the server needs. Paths must answer with Content-Length
+(every route except /api/v1/documents/export).
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from urllib.parse import urlsplit
+
+from benchmarks.common import summarize
+from hermanitto_docs_api.core.security import create_access_token
+
+
+async def fetch(reader, writer, request: bytes) -> int:
+    writer.write(request)
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.lower() == b"content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def drive(url, path: str, token: str, total: int, concurrency: int):
+    latencies: list[float] = []
+    errors = 0
+    indexes = iter(range(total))
+    request = (
+        f"GET {path} HTTP/1.1\r\nHost: {url.netloc}\r\n"
+        f"Authorization: Bearer {token}\r\n\r\n"
+    ).encode()
+
+    async def worker():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(url.hostname, url.port)
+        try:
+            for _ in indexes:
+                start = time.perf_counter()
+                status = await fetch(reader, writer, request)
+                latencies.append(time.perf_counter() - start)
+                if status >= 400:
+                    errors += 1
+        finally:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result = summarize(latencies, time.perf_counter() - started)
+    result["errors"] = errors
+    return result
+
+
+async def run(args) -> dict:
+    token = create_access_token({"sub": args.user})
+    url = urlsplit(args.url)
+    routes = {}
+    for path in args.path:
+        # Aquecimento: popula caches e pools do servidor
+        await drive(url, path, token, args.concurrency, args.concurrency)
+        routes[path] = await drive(
+            url, path, token, args.requests, args.concurrency
+        )
+        print(f"{path}: {routes[path]}", file=sys.stderr)
+    return {
+        "meta": {
+            "url": args.url,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+        },
+        "routes": routes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--path", action="append", default=None)
+    parser.add_argument("--user", default="bench-user-0")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--requests", type=int, default=2000, help="requests per path"
+    )
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args()
+    args.path = args.path or ["/healthz"]
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
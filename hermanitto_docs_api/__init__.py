@@ -0,0 +1,4 @@
+import time
+
+# Início da importação do app, para medir o tempo até ficar pronto
+IMPORT_STARTED = time.perf_counter()
@@ -0,0 +1,58 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, Response
+from hermanitto_docs_api.core.dependencies import (
+    pool_stats,
+    read_engine,
+    read_router,
+)
+from hermanitto_docs_api.core.metrics import CONTENT_TYPE, render_metrics
+from hermanitto_docs_api.core.rate_limit import login_limiter
+from hermanitto_docs_api.core.readiness import readiness
+from hermanitto_docs_api.core.response_cache import response_cache
+from hermanitto_docs_api.core.security import token_cache
+from hermanitto_docs_api.services.type_cache import type_cache
+from hermanitto_docs_api.services.user_service import user_cache
+
+router = APIRouter()
+
+
+@router.get("/healthz")
+async def healthz():
+    # Liveness: o processo responde, sem tocar no banco
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readyz():
+    # Readiness: só depois do aquecimento feito no lifespan
+    if not readiness.ready:
+        return JSONResponse(
+            {"status": "starting", "error": readiness.error},
+            status_code=503,
+        )
+    return {"status": "ready", **readiness.stats()}
+
+
+@router.get("/pool-stats")
+async def get_pool_stats():
+    stats = pool_stats()
+    if read_engine is not None:
+        stats["read"] = pool_stats(read_engine.pool)
+    return stats
+
+
+@router.get("/metrics")
+async def get_metrics():
+    gauges = {
+        "app": readiness.stats(),
+        "db_pool": pool_stats(),
+        "db_read": read_router.stats(),
+        "type_cache": type_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "login_rate_limit": login_limiter.stats(),
+    }
+    if read_engine is not None:
+        gauges["db_read_pool"] = pool_stats(read_engine.pool)
+    return Response(render_metrics(gauges), media_type=CONTENT_TYPE)
@@ -1,18 +1,83 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Literal
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from hermanitto_docs_api.schemas.document_schema import (
+    DocumentBulkResult,
     DocumentCreate,
+    DocumentFilters,
+    DocumentImportResult,
     DocumentOut,
+    DocumentPage,
+    LinkCheckResultPage,
+    LinkCheckStatus,
 )
 from hermanitto_docs_api.services.document_service import (
+    SEARCH_MIN_LENGTH,
     create_document,
+    create_documents_bulk,
+    documents_version,
+    export_documents,
+    import_documents,
     list_documents,
+    search_documents,
+)
+from hermanitto_docs_api.core.config import settings
+from hermanitto_docs_api.core.dependencies import (
+    get_db,
+    get_read_db,
+    get_session_factory,
+)
+from hermanitto_docs_api.core.fast_json import (
+    dump_rows,
+    fast_json_enabled,
+    fast_json_response,
 )
-from hermanitto_docs_api.core.dependencies import get_db
+from hermanitto_docs_api.core.http_cache import not_modified
+from hermanitto_docs_api.core.response_cache import response_cache
 from hermanitto_docs_api.core.security import get_current_user
+from hermanitto_docs_api.services.link_checker import (
+    link_check_sweep,
+    list_link_results,
+)
 
 router = APIRouter()
 
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+IMPORT_EXTENSIONS: dict[str, Literal["csv", "jsonl"]] = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+
+def document_filters(
+    type_id: list[int] = Query([]),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    updated_from: datetime | None = None,
+    updated_to: datetime | None = None,
+) -> DocumentFilters:
+    # Intervalos semiabertos: *_from inclusivo, *_to exclusivo
+    return DocumentFilters(
+        type_ids=type_id,
+        created_from=created_from,
+        created_to=created_to,
+        updated_from=updated_from,
+        updated_to=updated_to,
+    )
+
 
 @router.post("/", response_model=DocumentOut)
 async def create_doc(
@@ -23,8 +88,155 @@ async def create_doc(
     return await create_document(db, doc_in)
 
 
-@router.get("/", response_model=list[DocumentOut])
+@router.post("/bulk", response_model=DocumentBulkResult)
+async def create_docs_bulk(
+    docs_in: list[DocumentCreate],
+    db: AsyncSession = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    return await create_documents_bulk(db, docs_in)
+
+
+@router.post("/import", response_model=DocumentImportResult)
+async def import_docs(
+    file: UploadFile = File(...),
+    fmt: Literal["csv", "jsonl"] | None = Query(None, alias="format"),
+    db: AsyncSession = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    # Sem ?format=, o formato vem da extensão do arquivo
+    if fmt is None:
+        name = (file.filename or "").lower()
+        fmt = next(
+            (f for ext, f in IMPORT_EXTENSIONS.items() if name.endswith(ext)),
+            None,
+        )
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported file format",
+        )
+    return await import_documents(db, file, fmt)
+
+
+@router.get("/", response_model=DocumentPage)
 async def get_docs(
-    db: AsyncSession = Depends(get_db), user=Depends(get_current_user)
+    request: Request,
+    response: Response,
+    limit: int = Query(
+        settings.DOCUMENTS_PAGE_SIZE,
+        ge=1,
+        le=settings.DOCUMENTS_MAX_PAGE_SIZE,
+    ),
+    cursor: str | None = None,
+    filters: DocumentFilters = Depends(document_filters),
+    include_archived: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+    user=Depends(get_current_user),
+):
+    async def build():
+        cached = not_modified(request, response, await documents_version(db))
+        if cached:
+            return cached
+        if fast_json_enabled():
+            page = await list_documents(
+                db,
+                limit,
+                cursor,
+                filters,
+                rows=True,
+                include_archived=include_archived,
+            )
+            page["items"] = dump_rows(page["items"], DocumentOut)
+            return fast_json_response(page, response)
+        return await list_documents(
+            db, limit, cursor, filters, include_archived=include_archived
+        )
+
+    return await response_cache.serve(
+        request, response, ("documents",), DocumentPage, build
+    )
+
+
+@router.get("/search", response_model=list[DocumentOut])
+async def search_docs(
+    request: Request,
+    response: Response,
+    q: str = Query(min_length=SEARCH_MIN_LENGTH, max_length=255),
+    limit: int = Query(
+        settings.DOCUMENTS_SEARCH_LIMIT,
+        ge=1,
+        le=settings.DOCUMENTS_SEARCH_MAX_LIMIT,
+    ),
+    db: AsyncSession = Depends(get_read_db),
+    user=Depends(get_current_user),
+):
+    async def build():
+        if fast_json_enabled():
+            docs = await search_documents(db, q, limit, rows=True)
+            return fast_json_response(dump_rows(docs, DocumentOut), response)
+        return await search_documents(db, q, limit)
+
+    return await response_cache.serve(
+        request, response, ("documents",), list[DocumentOut], build
+    )
+
+
+@router.get("/export")
+async def export_docs(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    include_archived: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+    user=Depends(get_current_user),
+):
+    return StreamingResponse(
+        export_documents(
+            db, fmt, settings.DOCUMENTS_EXPORT_CHUNK_SIZE, include_archived
+        ),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="documents.{fmt}"'
+        },
+    )
+
+
+@router.post(
+    "/link-check",
+    response_model=LinkCheckStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def start_link_check(
+    wait: bool = False,
+    session_factory=Depends(get_session_factory),
+    user=Depends(get_current_user),
+):
+    # Roda em segundo plano; wait=true espera o fim (útil para cron/testes)
+    if link_check_sweep.running:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Link check already running",
+        )
+    task = link_check_sweep.start(session_factory)
+    if wait:
+        await task
+    return link_check_sweep.status
+
+
+@router.get("/link-check", response_model=LinkCheckStatus)
+async def get_link_check_status(user=Depends(get_current_user)):
+    return link_check_sweep.status
+
+
+@router.get("/link-check/results", response_model=LinkCheckResultPage)
+async def get_link_check_results(
+    limit: int = Query(
+        settings.DOCUMENTS_PAGE_SIZE,
+        ge=1,
+        le=settings.DOCUMENTS_MAX_PAGE_SIZE,
+    ),
+    cursor: int = 0,
+    broken_only: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+    user=Depends(get_current_user),
 ):
-    return await list_documents(db)
+    return await list_link_results(db, limit, cursor, broken_only)
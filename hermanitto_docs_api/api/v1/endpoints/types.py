@@ -1,12 +1,25 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from hermanitto_docs_api.core.security import get_current_user
 from sqlalchemy.ext.asyncio import AsyncSession
 from hermanitto_docs_api.schemas.document_type_schema import (
     DocumentTypeCreate,
     DocumentTypeOut,
+    DocumentTypeStats,
 )
-from hermanitto_docs_api.services.type_service import create_type, list_types
-from hermanitto_docs_api.core.dependencies import get_db
+from hermanitto_docs_api.services.type_service import (
+    create_type,
+    list_types,
+    type_stats,
+    types_version,
+)
+from hermanitto_docs_api.core.dependencies import get_db, get_read_db
+from hermanitto_docs_api.core.fast_json import (
+    dump_rows,
+    fast_json_enabled,
+    fast_json_response,
+)
+from hermanitto_docs_api.core.http_cache import not_modified
+from hermanitto_docs_api.core.response_cache import response_cache
 
 router = APIRouter()
 
@@ -20,6 +33,44 @@ async def create_document_type(
 
 @router.get("/", response_model=list[DocumentTypeOut])
 async def get_types(
-    db: AsyncSession = Depends(get_db), user=Depends(get_current_user)
+    request: Request,
+    response: Response,
+    # Fica no primário: a lista vem do type_cache, compartilhado pelo
+    # processo, e uma carga atrasada da réplica ficaria em cache até o TTL
+    db: AsyncSession = Depends(get_db),
+    user=Depends(get_current_user),
 ):
-    return await list_types(db)
+    async def build():
+        cached = not_modified(request, response, await types_version(db))
+        if cached:
+            return cached
+        doc_types = await list_types(db)
+        if fast_json_enabled():
+            return fast_json_response(
+                dump_rows(doc_types, DocumentTypeOut), response
+            )
+        return doc_types
+
+    return await response_cache.serve(
+        request, response, ("types",), list[DocumentTypeOut], build
+    )
+
+
+@router.get("/stats", response_model=list[DocumentTypeStats])
+async def get_type_stats(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    user=Depends(get_current_user),
+):
+    # As contagens mudam com os documentos: as duas tags invalidam
+    async def build():
+        return await type_stats(db)
+
+    return await response_cache.serve(
+        request,
+        response,
+        ("types", "documents"),
+        list[DocumentTypeStats],
+        build,
+    )
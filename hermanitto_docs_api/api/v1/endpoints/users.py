@@ -1,26 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import math
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from hermanitto_docs_api.schemas.user_schema import UserCreate, UserOut
 from hermanitto_docs_api.services.user_service import (
     create_user,
     authenticate_user,
-    get_user_by_username,
+    get_user_profile,
 )
-from hermanitto_docs_api.core.dependencies import get_db
+from hermanitto_docs_api.core.config import settings
+from hermanitto_docs_api.core.dependencies import get_db, get_read_db
+from hermanitto_docs_api.core.rate_limit import login_limiter
 from hermanitto_docs_api.core.security import (
     create_access_token,
     get_current_user,
+    get_token_claims,
 )
 
 router = APIRouter()
 
 
+async def throttle_login(user: UserCreate, request: Request):
+    # Roda antes de qualquer consulta ou bcrypt. O balde do IP vem
+    # primeiro: uma enxurrada de um endereço não esgota o balde do
+    # usuário atacado.
+    client_ip = request.client.host if request.client else "unknown"
+    wait = await login_limiter.check(
+        f"login:ip:{client_ip}", settings.LOGIN_RATE_LIMIT_PER_IP
+    ) or await login_limiter.check(
+        f"login:user:{user.username}", settings.LOGIN_RATE_LIMIT_PER_USER
+    )
+    if wait:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
+
+
 @router.post("/register", response_model=UserOut)
 async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
     return await create_user(db, user)
 
 
-@router.post("/login")
+@router.post("/login", dependencies=[Depends(throttle_login)])
 async def login(user: UserCreate, db: AsyncSession = Depends(get_db)):
     db_user = await authenticate_user(db, user.username, user.password)
     if not db_user:
@@ -28,16 +50,20 @@ async def login(user: UserCreate, db: AsyncSession = Depends(get_db)):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
         )
-    token = create_access_token({"sub": db_user.username})
+    token = create_access_token({}, user=db_user)
     return {"access_token": token, "token_type": "bearer"}
 
 
 @router.get("/me", response_model=UserOut)
 async def get_me(
+    request: Request,
     username: str = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    claims: dict = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    user = await get_user_by_username(db, username)
+    # Cache-Control: no-cache força a leitura do banco
+    fresh = "no-cache" in request.headers.get("cache-control", "")
+    user = await get_user_profile(db, username, claims, fresh=fresh)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
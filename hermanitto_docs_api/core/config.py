@@ -11,6 +11,113 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Engine / pool de conexões (ignorados no SQLite)
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    # Loga aviso (possível N+1) quando uma requisição repete o mesmo
+    # statement mais vezes que isso
+    SQL_REPEAT_WARN_THRESHOLD: int = 10
+
+    # Réplica de leitura opcional (mesmo formato de DATABASE_URL)
+    READ_DATABASE_URL: str = ""
+    # Após um commit, as leituras do mesmo cliente vão ao primário
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    # Após uma falha de conexão, quanto tempo a réplica fica de fora
+    READ_REPLICA_RETRY_SECONDS: float = 30.0
+
+    # Aquecimento na subida: conexões abertas por pool antes de /readyz
+    # responder (limitado a DB_POOL_SIZE; 0 desativa) e intervalo entre
+    # tentativas enquanto o banco não responde
+    WARMUP_DB_CONNECTIONS: int = 5
+    WARMUP_RETRY_SECONDS: float = 5.0
+
+    # Tokens já verificados mantidos em memória (LRU)
+    TOKEN_CACHE_SIZE: int = 10000
+    # Perfis de usuário (/me) de tokens sem as claims do perfil
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: float = 300
+
+    # Custo do bcrypt (log2 das iterações). Hashes com outro custo são
+    # refeitos de forma transparente no próximo login.
+    BCRYPT_ROUNDS: int = 12
+    # Threads dedicadas ao bcrypt, fora do event loop
+    PASSWORD_HASH_WORKERS: int = 4
+
+    # Limite de tentativas de login por minuto (também a rajada máxima),
+    # por usuário e por IP; 0 desativa
+    LOGIN_RATE_LIMIT_PER_USER: int = 5
+    LOGIN_RATE_LIMIT_PER_IP: int = 20
+    # Backend compartilhado entre workers (ex.: redis://localhost:6379/0);
+    # vazio usa memória, com no máximo RATE_LIMIT_MAX_KEYS baldes
+    RATE_LIMIT_BACKEND_URL: str = ""
+    RATE_LIMIT_MAX_KEYS: int = 100000
+
+    # Paginação da listagem de documentos
+    DOCUMENTS_PAGE_SIZE: int = 50
+    DOCUMENTS_MAX_PAGE_SIZE: int = 500
+    # Linhas lidas do cursor do servidor por bloco na exportação
+    DOCUMENTS_EXPORT_CHUNK_SIZE: int = 1000
+    # Máximo de itens aceitos por chamada de criação em lote
+    DOCUMENTS_BULK_MAX_ITEMS: int = 1000
+    # Linhas por lote (e por commit) na importação de arquivos
+    DOCUMENTS_IMPORT_BATCH_SIZE: int = 5000
+    # Quantos erros de linha a importação devolve no resumo
+    DOCUMENTS_IMPORT_MAX_ERRORS: int = 100
+    # Tamanho máximo de uma linha do arquivo importado (caracteres)
+    DOCUMENTS_IMPORT_MAX_LINE_LENGTH: int = 4096
+    # Resultados por busca de link (padrão e máximo)
+    DOCUMENTS_SEARCH_LIMIT: int = 20
+    DOCUMENTS_SEARCH_MAX_LIMIT: int = 100
+    # Partições mensais de documents criadas adiante do mês corrente
+    # (PostgreSQL; na subida e pelo job de manutenção)
+    DOCUMENTS_PARTITION_MONTHS_AHEAD: int = 3
+    # Meses completos mantidos em documents; os anteriores vão para
+    # documents_archive no job de arquivamento (0 desativa)
+    DOCUMENTS_RETENTION_MONTHS: int = 0
+    # Linhas movidas por lote (e por commit) quando não há partição
+    # inteira para desanexar
+    DOCUMENTS_ARCHIVE_BATCH_SIZE: int = 5000
+
+    # Listagens serializadas com orjson a partir do ORM, sem a validação
+    # do response_model (requer o pacote orjson)
+    FAST_JSON: bool = False
+    # Respostas a partir deste tamanho (bytes) são comprimidas com gzip
+    GZIP_MINIMUM_SIZE: int = 1024
+
+    # Verificação de links: requisições simultâneas (total e por host),
+    # timeout de cada requisição e documentos lidos por lote
+    LINK_CHECK_CONCURRENCY: int = 20
+    LINK_CHECK_PER_HOST: int = 4
+    LINK_CHECK_TIMEOUT_SECONDS: float = 10.0
+    LINK_CHECK_BATCH_SIZE: int = 500
+    # Permite verificar links que resolvem para endereços privados,
+    # loopback ou link-local (desligado: proteção contra SSRF)
+    LINK_CHECK_ALLOW_PRIVATE: bool = False
+
+    # Cache das respostas dos GETs de documentos e tipos (0 desativa);
+    # backend compartilhado opcional (redis://host:6379/0)
+    RESPONSE_CACHE_TTL_SECONDS: float = 0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+    RESPONSE_CACHE_BACKEND_URL: str = ""
+
+    # Cache em memória dos tipos de documento (segundos)
+    TYPE_CACHE_TTL_SECONDS: float = 300
+
+    # Servidor de produção (hermanitto_docs_api/server.py); os argumentos
+    # da linha de comando têm precedência. 0 workers = um por CPU
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_SECONDS: int = 5
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    SERVER_ACCESS_LOG: bool = False
+
     # Model configuration (app-level feature toggle)
     # Default model used by the application when creating requests to
     # an LLM provider. Setting this only changes which model the app
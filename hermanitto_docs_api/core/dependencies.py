@@ -1,15 +1,230 @@
+import asyncio
+import logging
+import time
+from fastapi import Request
+from sqlalchemy import event, make_url
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
 )
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from hermanitto_docs_api.core.cache import LRUCache
 from hermanitto_docs_api.core.config import settings
+from hermanitto_docs_api.core.query_stats import instrument_engine
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    # Mede quanto tempo cada checkout leva para obter uma conexão (espera
+    # na fila do pool + abertura de conexão nova + pre-ping).
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            elapsed = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_seconds_total += elapsed
+            self.wait_seconds_max = max(self.wait_seconds_max, elapsed)
+
+
+def engine_options(database_url: str) -> dict:
+    options: dict = {"echo": settings.DB_ECHO}
+    url = make_url(database_url)
+    # SQLite (testes/desenvolvimento) usa o pool padrão do dialeto
+    if url.get_backend_name() == "sqlite":
+        return options
+    options.update(
+        poolclass=InstrumentedPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "prepared_statement_cache_size": (
+                settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+            )
+        }
+    return options
+
+
+def enable_sqlite_foreign_keys(engine):
+    # O SQLite só aplica chaves estrangeiras com o pragma ligado, conexão
+    # por conexão; create_document conta com a constraint de type_id
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if sync_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _foreign_keys_on(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+engine = create_async_engine(
+    settings.DATABASE_URL, **engine_options(settings.DATABASE_URL)
+)
+instrument_engine(engine)
+enable_sqlite_foreign_keys(engine)
+# expire_on_commit=False: as entidades devolvidas por INSERT ... RETURNING
+# continuam legíveis após o commit, sem um SELECT de refresh
 SessionLocal = async_sessionmaker(
-    autocommit=False, autoflush=False, bind=engine
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
 )
 
+# Réplica de leitura opcional, com pool próprio. Sem READ_DATABASE_URL,
+# get_read_db usa o primário.
+read_engine = None
+ReadSessionLocal = None
+if settings.READ_DATABASE_URL:
+    read_engine = create_async_engine(
+        settings.READ_DATABASE_URL,
+        **engine_options(settings.READ_DATABASE_URL),
+    )
+    instrument_engine(read_engine)
+    ReadSessionLocal = async_sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        bind=read_engine,
+    )
+
+
+def pool_stats(pool=None) -> dict:
+    pool = pool or engine.pool
+    stats: dict = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # overflow() fica negativo enquanto o pool não está cheio
+            overflow=max(pool.overflow(), 0),
+        )
+    if isinstance(pool, InstrumentedPool):
+        stats.update(
+            checkouts=pool.checkouts,
+            wait_seconds_total=pool.wait_seconds_total,
+            wait_seconds_max=pool.wait_seconds_max,
+        )
+    return stats
+
+
+class ReadRouter:
+    # Decide se uma leitura vai para a réplica ou para o primário:
+    # - X-Consistency: strong força o primário;
+    # - por READ_YOUR_WRITES_SECONDS após um commit do mesmo cliente (IP),
+    #   as leituras dele vão ao primário (janela por processo: entre
+    #   workers, use o cabeçalho);
+    # - se a réplica falhar ao conectar, o primário assume por
+    #   READ_REPLICA_RETRY_SECONDS antes de uma nova tentativa.
+
+    def __init__(self, max_clients: int = 100000):
+        self.recent_writers = LRUCache(max_clients)
+        self.replica_down_until = 0.0
+        self.counts = {
+            "replica": 0,
+            "primary_no_replica": 0,
+            "primary_consistency": 0,
+            "primary_recent_write": 0,
+            "primary_fallback": 0,
+        }
 
-async def get_db():
+    def mark_write(self, client: str):
+        if settings.READ_YOUR_WRITES_SECONDS > 0:
+            self.recent_writers.set(
+                client, True, ttl=settings.READ_YOUR_WRITES_SECONDS
+            )
+
+    def route(self, request: Request) -> str:
+        if ReadSessionLocal is None:
+            return "primary_no_replica"
+        if request.headers.get("x-consistency", "").lower() == "strong":
+            return "primary_consistency"
+        if self.recent_writers.get(client_key(request)):
+            return "primary_recent_write"
+        if time.monotonic() < self.replica_down_until:
+            return "primary_fallback"
+        return "replica"
+
+    def stats(self) -> dict:
+        return {
+            **self.counts,
+            "replica_down": int(time.monotonic() < self.replica_down_until),
+        }
+
+
+read_router = ReadRouter()
+
+
+def client_key(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_client_write(session):
+    # Sessões abertas por get_db levam o cliente em info; os commits delas
+    # abrem a janela de read-your-writes
+    client = session.info.get("client")
+    if client is not None:
+        read_router.mark_write(client)
+
+
+async def get_db(request: Request):
     async with SessionLocal() as session:
+        session.info["client"] = client_key(request)
+        yield session
+
+
+async def _open_replica_session():
+    session = ReadSessionLocal()
+    try:
+        # Conecta já, para poder cair no primário se a réplica não responde
+        await session.connection()
+        return session
+    except (DBAPIError, OSError, asyncio.TimeoutError):
+        await session.close()
+        logger.warning(
+            "Read replica unavailable, using primary", exc_info=True
+        )
+        read_router.replica_down_until = (
+            time.monotonic() + settings.READ_REPLICA_RETRY_SECONDS
+        )
+        return None
+
+
+async def get_read_db(request: Request):
+    """Session for read-only endpoints, on the replica when possible."""
+    route = read_router.route(request)
+    session = None
+    if route == "replica":
+        session = await _open_replica_session()
+        if session is None:
+            route = "primary_fallback"
+    read_router.counts[route] += 1
+    # O cache de respostas não guarda leituras da réplica recém-invalidadas
+    request.state.db_read_route = route
+    if session is None:
+        session = SessionLocal()
+    async with session:
         yield session
+
+
+def get_session_factory():
+    # Para trabalho que sobrevive à requisição (tarefas em segundo plano),
+    # que abre as próprias sessões em vez de usar a de get_db
+    return SessionLocal
@@ -0,0 +1,38 @@
+from types import ModuleType
+from fastapi import Response
+from pydantic import BaseModel
+from hermanitto_docs_api.core.config import settings
+
+orjson: ModuleType | None
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+
+def fast_json_enabled() -> bool:
+    return settings.FAST_JSON and orjson is not None
+
+
+def dump_rows(rows, schema: type[BaseModel]) -> list[dict]:
+    # Saída do banco é confiável: lê os campos do schema direto dos
+    # atributos (entidades, Rows ou modelos já validados), sem validar de
+    # novo. Só serve para schemas planos (tipos que o orjson serializa
+    # nativamente, como int, str e datetime).
+    fields = tuple(schema.model_fields)
+    return [{name: getattr(row, name) for name in fields} for row in rows]
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        # Só usada com fast_json_enabled(), isto é, com o orjson instalado
+        assert orjson is not None
+        return orjson.dumps(content)
+
+
+def fast_json_response(content, response: Response) -> FastJSONResponse:
+    # Devolver uma Response ignora os cabeçalhos da Response injetada no
+    # endpoint (ex.: ETag); copia-os.
+    return FastJSONResponse(content, headers=response.headers)
@@ -0,0 +1,38 @@
+import hashlib
+from fastapi import Request, Response
+
+
+def make_etag(version: str, request: Request) -> str:
+    # A versão é da coleção inteira; a query string (filtros, cursor,
+    # limit) entra no hash para que cada visão tenha seu próprio ETag.
+    raw = f"{version}|{request.url.path}?{request.url.query}"
+    return f'W/"{hashlib.sha1(raw.encode()).hexdigest()[:20]}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    # Comparação fraca (RFC 9110): ignora o prefixo W/
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque
+        for tag in if_none_match.split(",")
+    )
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return _matches(if_none_match, etag)
+
+
+def not_modified(
+    request: Request, response: Response, version: str
+) -> Response | None:
+    """Set the ETag for `version`; return a 304 if the client has it."""
+    etag = make_etag(version, request)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
@@ -0,0 +1,158 @@
+import time
+from bisect import bisect_left
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RouteSeries:
+    # Um histograma por (método, rota, status). Os buckets são alocados
+    # uma vez; observe() só incrementa contadores.
+    __slots__ = ("labels", "counts", "total", "sum")
+
+    def __init__(self, method: str, route: str, status_code: int):
+        self.labels = (
+            f'method="{_escape(method)}",route="{_escape(route)}",'
+            f'status="{status_code}"'
+        )
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += 1
+        self.sum += seconds
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.in_flight = 0
+        self.series: dict[tuple, RouteSeries] = {}
+
+    def observe(self, method, route, status_code, seconds):
+        key = (method, route, status_code)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = RouteSeries(*key)
+        series.observe(seconds)
+
+    def render(self) -> list[str]:
+        lines = [
+            "# HELP http_requests_total Requests by route and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        series = list(self.series.values())
+        lines += [
+            f"http_requests_total{{{s.labels}}} {s.total}" for s in series
+        ]
+        lines += [
+            "# HELP http_requests_in_flight Requests being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_request_duration_seconds Request latency.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        bounds = [str(b) for b in LATENCY_BUCKETS] + ["+Inf"]
+        for s in series:
+            cumulative = 0
+            for bound, count in zip(bounds, s.counts):
+                cumulative += count
+                lines.append(
+                    f"http_request_duration_seconds_bucket"
+                    f'{{{s.labels},le="{bound}"}} {cumulative}'
+                )
+            lines.append(
+                f"http_request_duration_seconds_sum{{{s.labels}}} {s.sum}"
+            )
+            lines.append(
+                f"http_request_duration_seconds_count{{{s.labels}}} {s.total}"
+            )
+        return lines
+
+
+request_metrics = RequestMetrics()
+
+# id(rota) -> template completo. Versões recentes do FastAPI não copiam as
+# rotas em include_router, então scope["route"].path não tem o prefixo.
+route_templates: dict[int, str] = {}
+
+
+def register_route_prefix(router, prefix: str):
+    for route in router.routes:
+        route_templates[id(route)] = prefix + route.path
+
+
+def render_gauges(prefix: str, stats: dict) -> list[str]:
+    # Converte os dicionários de stats() (pool, caches) em gauges;
+    # valores não numéricos são ignorados.
+    lines = []
+    for name, value in stats.items():
+        if isinstance(value, bool):
+            value = int(value)
+        if isinstance(value, (int, float)):
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {value}")
+    return lines
+
+
+def render_metrics(gauges: dict[str, dict]) -> str:
+    lines = request_metrics.render()
+    for prefix, stats in gauges.items():
+        lines += render_gauges(prefix, stats)
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    # Middleware ASGI: contagem, requisições em andamento e latência por
+    # template de rota (ex.: /api/v1/documents/) e status.
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        request_metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_metrics.in_flight -= 1
+            # O roteador grava a rota encontrada no próprio scope
+            route = scope.get("route")
+            template = route_templates.get(id(route)) or getattr(
+                route, "path", "<unmatched>"
+            )
+            request_metrics.observe(
+                scope["method"],
+                template,
+                status_code,
+                time.perf_counter() - start,
+            )
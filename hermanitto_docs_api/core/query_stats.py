@@ -0,0 +1,108 @@
+import logging
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+from hermanitto_docs_api.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    # Estatísticas de SQL de uma requisição: total de statements, tempo
+    # acumulado e quantas vezes cada statement (já parametrizado, então o
+    # texto é a "forma" da consulta) foi executado.
+    __slots__ = ("path", "count", "duration", "shapes", "warn_repeats")
+
+    def __init__(self, path: str = ""):
+        self.path = path
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: dict[str, int] = {}
+        self.warn_repeats = True
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, *args):
+    # Um valor só (statements de uma conexão não se aninham): um statement
+    # que falha não chega ao after e não deixa nada acumulado
+    conn.info["query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, *args):
+    elapsed = time.perf_counter() - conn.info.pop("query_start")
+    stats = current_query_stats.get()
+    if stats is None:
+        return
+    stats.count += 1
+    stats.duration += elapsed
+    repeats = stats.shapes.get(statement, 0) + 1
+    stats.shapes[statement] = repeats
+    # Avisa uma vez por forma de consulta, ao passar do limite
+    if (
+        stats.warn_repeats
+        and repeats == settings.SQL_REPEAT_WARN_THRESHOLD + 1
+    ):
+        logger.warning(
+            "Possible N+1: statement executed more than %d times in %s: %s",
+            settings.SQL_REPEAT_WARN_THRESHOLD,
+            stats.path,
+            statement,
+        )
+
+
+def quiet_repeated_queries():
+    # Para rotas que repetem um statement por design (ex.: um INSERT por
+    # lote numa importação): mantém as contagens, sem o aviso de N+1.
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.warn_repeats = False
+
+
+def instrument_engine(engine):
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(
+        sync_engine, "before_cursor_execute", _before_cursor_execute
+    ):
+        event.listen(
+            sync_engine, "before_cursor_execute", _before_cursor_execute
+        )
+        event.listen(
+            sync_engine, "after_cursor_execute", _after_cursor_execute
+        )
+
+
+class QueryStatsMiddleware:
+    # Coleta as estatísticas de SQL de cada requisição e as devolve no
+    # cabeçalho Server-Timing (ex.: db;desc="3 queries";dur=1.250).
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope["path"])
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                timing = (
+                    f'db;desc="{stats.count} queries";'
+                    f"dur={stats.duration * 1000:.3f}"
+                )
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", timing.encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
@@ -0,0 +1,145 @@
+import logging
+import time
+from abc import ABC, abstractmethod
+from hermanitto_docs_api.core.cache import LRUCache
+from hermanitto_docs_api.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitBackend(ABC):
+    # Guarda os baldes (token bucket). A memória serve a um processo; com
+    # vários workers use um backend compartilhado (RedisRateLimitBackend).
+
+    @abstractmethod
+    async def take(self, key: str, capacity: int, per_second: float) -> float:
+        """Take one token from `key`'s bucket.
+
+        Returns 0 when the token was available, otherwise the seconds
+        until the next one.
+        """
+
+    async def clear(self):
+        pass
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, max_keys: int):
+        # LRU: uma enxurrada de chaves distintas não cresce sem limite
+        self._buckets = LRUCache(max_keys)
+
+    async def take(self, key: str, capacity: int, per_second: float) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * per_second)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / per_second
+        self._buckets.set(key, (tokens, now))
+        return wait
+
+    async def clear(self):
+        self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# Mesmo algoritmo, atômico no servidor e com o relógio do Redis (os
+# workers não precisam ter relógios sincronizados). Devolve string:
+# números do Lua viram inteiros na resposta.
+_REDIS_TAKE = """
+local capacity = tonumber(ARGV[1])
+local per_second = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * per_second)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = (1 - tokens) / per_second
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / per_second * 1000))
+return tostring(wait)
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    # `client` é um redis.asyncio.Redis (ou compatível, com eval()).
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisRateLimitBackend":
+        try:
+            import redis.asyncio
+        except ImportError:
+            raise RuntimeError(
+                "RATE_LIMIT_BACKEND_URL requires the 'redis' package"
+            )
+        return cls(redis.asyncio.from_url(url))
+
+    async def take(self, key: str, capacity: int, per_second: float) -> float:
+        reply = await self.client.eval(
+            _REDIS_TAKE, 1, self.prefix + key, capacity, per_second
+        )
+        return float(reply)
+
+
+class RateLimiter:
+    # Aplica os limites sobre um backend e conta as decisões. Se o backend
+    # falhar, deixa passar (fail open) e conta o erro: o limitador protege
+    # a CPU, não deve derrubar o login.
+
+    def __init__(self, backend: RateLimitBackend):
+        self.backend = backend
+        self.allowed = 0
+        self.rejected = 0
+        self.backend_errors = 0
+
+    async def check(self, key: str, per_minute: int) -> float:
+        if per_minute <= 0:
+            return 0.0
+        try:
+            wait = await self.backend.take(key, per_minute, per_minute / 60)
+        except Exception:
+            logger.warning("Rate limit backend failed", exc_info=True)
+            self.backend_errors += 1
+            return 0.0
+        if wait:
+            self.rejected += 1
+        else:
+            self.allowed += 1
+        return wait
+
+    async def reset(self):
+        self.allowed = self.rejected = self.backend_errors = 0
+        await self.backend.clear()
+
+    def stats(self) -> dict:
+        stats = {
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "backend_errors": self.backend_errors,
+        }
+        if isinstance(self.backend, MemoryRateLimitBackend):
+            stats["keys"] = len(self.backend)
+        return stats
+
+
+def _make_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_BACKEND_URL:
+        return RedisRateLimitBackend.from_url(settings.RATE_LIMIT_BACKEND_URL)
+    return MemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS)
+
+
+login_limiter = RateLimiter(_make_backend())
@@ -0,0 +1,71 @@
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    # Estado do aquecimento, para /readyz e /metrics. `import_started` é
+    # o instante (perf_counter) em que o app começou a ser importado.
+
+    def __init__(self):
+        self.ready = False
+        self.attempts = 0
+        self.error: str | None = None
+        self.warmup_seconds: float | None = None
+        self.import_to_ready_seconds: float | None = None
+
+    def mark_ready(self, import_started: float, warmup_seconds: float):
+        self.ready = True
+        self.error = None
+        self.warmup_seconds = warmup_seconds
+        self.import_to_ready_seconds = time.perf_counter() - import_started
+        logger.info(
+            "Ready %.3fs after import (warm-up %.3fs)",
+            self.import_to_ready_seconds,
+            warmup_seconds,
+        )
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "warmup_attempts": self.attempts,
+            "warmup_seconds": self.warmup_seconds,
+            "import_to_ready_seconds": self.import_to_ready_seconds,
+        }
+
+
+async def open_connections(engine, count: int):
+    """Open up to `count` pool connections at once and run SELECT 1.
+
+    The connections go back to the pool afterwards, so the first
+    requests find them already established.
+    """
+    pool = engine.pool
+    # Pools sem tamanho (SQLite) guardam uma conexão só
+    count = min(count, pool.size()) if isinstance(pool, QueuePool) else 1
+    if count <= 0:
+        return
+    async with AsyncExitStack() as stack:
+        # Todas abertas ao mesmo tempo: em sequência, o pool devolveria a
+        # mesma conexão a cada checkout
+        conns = [engine.connect() for _ in range(count)]
+        started = await asyncio.gather(
+            *(conn.start() for conn in conns), return_exceptions=True
+        )
+        for conn, result in zip(conns, started):
+            if not isinstance(result, BaseException):
+                stack.push_async_callback(conn.close)
+        for result in started:
+            if isinstance(result, BaseException):
+                raise result
+        await asyncio.gather(
+            *(conn.execute(text("SELECT 1")) for conn in conns)
+        )
+
+
+readiness = Readiness()
@@ -0,0 +1,268 @@
+import hashlib
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from functools import lru_cache
+from urllib.parse import urlencode
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from hermanitto_docs_api.core.cache import LRUCache
+from hermanitto_docs_api.core.config import settings
+from hermanitto_docs_api.core.http_cache import etag_matches
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCacheBackend(ABC):
+    # Guarda corpos de resposta e a versão de cada tag. Invalidar uma tag
+    # incrementa a versão, que faz parte da chave: as entradas antigas
+    # ficam inalcançáveis e saem pelo TTL/LRU. A memória serve a um
+    # processo; com vários workers use um backend compartilhado.
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float):
+        pass
+
+    @abstractmethod
+    async def tag_versions(self, tags: tuple[str, ...]) -> list[int]:
+        pass
+
+    @abstractmethod
+    async def bump(self, tag: str):
+        pass
+
+    async def clear(self):
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+
+class MemoryResponseCacheBackend(ResponseCacheBackend):
+    def __init__(self, max_entries: int):
+        self._entries = LRUCache(max_entries)
+        self._versions: dict[str, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        self._entries.set(key, value, ttl=ttl)
+
+    async def tag_versions(self, tags: tuple[str, ...]) -> list[int]:
+        return [self._versions.get(tag, 0) for tag in tags]
+
+    async def bump(self, tag: str):
+        self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    async def clear(self):
+        self._entries.clear()
+        self._entries.evictions = 0
+        self._versions.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "evictions": self._entries.evictions,
+        }
+
+
+class RedisResponseCacheBackend(ResponseCacheBackend):
+    # `client` é um redis.asyncio.Redis ou compatível (get, set com px,
+    # mget e incr). O Redis expira as entradas; a política de memória
+    # (ex.: allkeys-lru) faz as vezes do LRU.
+
+    def __init__(self, client, prefix: str = "respcache:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisResponseCacheBackend":
+        try:
+            import redis.asyncio
+        except ImportError:
+            raise RuntimeError(
+                "RESPONSE_CACHE_BACKEND_URL requires the 'redis' package"
+            )
+        return cls(redis.asyncio.from_url(url))
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self.client.set(
+            self.prefix + key, value, px=max(1, int(ttl * 1000))
+        )
+
+    async def tag_versions(self, tags: tuple[str, ...]) -> list[int]:
+        values = await self.client.mget(
+            [f"{self.prefix}tag:{tag}" for tag in tags]
+        )
+        return [int(value or 0) for value in values]
+
+    async def bump(self, tag: str):
+        await self.client.incr(f"{self.prefix}tag:{tag}")
+
+
+@lru_cache
+def _adapter(schema) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def _render(content, schema) -> bytes:
+    # Mesmo formato que o response_model produziria, a partir de
+    # entidades do ORM ou dicionários
+    adapter = _adapter(schema)
+    return adapter.dump_json(
+        adapter.validate_python(content, from_attributes=True)
+    )
+
+
+class ResponseCache:
+    # Cache dos corpos JSON dos GETs, por caminho + query string + versões
+    # das tags. Falhas do backend não derrubam a leitura (fail open).
+
+    def __init__(self, backend: ResponseCacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+        self.backend_errors = 0
+        # Versão de cada tag e quando este processo a viu mudar
+        self._seen: dict[str, tuple[int, float]] = {}
+
+    def enabled(self) -> bool:
+        return settings.RESPONSE_CACHE_TTL_SECONDS > 0
+
+    async def _key(self, request: Request, tags: tuple[str, ...]) -> str:
+        versions = await self.backend.tag_versions(tags)
+        now = time.monotonic()
+        for tag, version in zip(tags, versions):
+            # Versão vista pela primeira vez conta como recém-trocada:
+            # outro worker pode tê-la acabado de invalidar
+            if self._seen.get(tag, (None, 0.0))[0] != version:
+                self._seen[tag] = (version, now)
+        query = urlencode(sorted(request.query_params.multi_items()))
+        raw = f"{request.url.path}?{query}|{versions}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _may_be_stale(self, request: Request, tags: tuple[str, ...]) -> bool:
+        # Leitura da réplica logo após uma invalidação pode não ter a
+        # escrita ainda; guardá-la fixaria o dado antigo na versão nova
+        # pelo TTL inteiro. get_read_db anota a rota em request.state.
+        if getattr(request.state, "db_read_route", None) != "replica":
+            return False
+        settled = time.monotonic() - settings.READ_YOUR_WRITES_SECONDS
+        return any(self._seen[tag][1] > settled for tag in tags)
+
+    async def serve(
+        self,
+        request: Request,
+        response: Response,
+        tags: tuple[str, ...],
+        schema,
+        build,
+    ):
+        """Serve a GET from the cache, or `build()` and store the result.
+
+        `build` returns the endpoint's usual result; anything that is
+        not a Response is rendered with `schema` (the response_model).
+        Results read from the replica within READ_YOUR_WRITES_SECONDS of
+        a tag change are served but not stored.
+        """
+        if not self.enabled():
+            return await build()
+        # Quem pede dado fresco não lê do cache (mas renova a entrada)
+        bypass = (
+            "no-cache" in request.headers.get("cache-control", "")
+            or request.headers.get("x-consistency", "").lower() == "strong"
+        )
+        try:
+            key = await self._key(request, tags)
+            entry = None if bypass else await self.backend.get(key)
+        except Exception:
+            logger.warning("Response cache backend failed", exc_info=True)
+            self.backend_errors += 1
+            return await build()
+        if entry is not None:
+            self.hits += 1
+            raw_etag, body = entry.split(b"\n", 1)
+            etag = raw_etag.decode()
+            etag_headers = {"ETag": etag} if etag else {}
+            if etag and etag_matches(request, etag):
+                return Response(status_code=304, headers=etag_headers)
+            return Response(
+                body, media_type="application/json", headers=etag_headers
+            )
+
+        self.misses += 1
+        result = await build()
+        headers: Mapping[str, str]
+        if isinstance(result, Response):
+            # 304 e afins não têm corpo para guardar
+            if result.status_code != 200:
+                return result
+            body, headers = bytes(result.body), result.headers
+        else:
+            body, headers = _render(result, schema), response.headers
+            result = Response(
+                body, media_type="application/json", headers=headers
+            )
+        if self._may_be_stale(request, tags):
+            return result
+        etag = headers.get("etag", "")
+        try:
+            await self.backend.set(
+                key,
+                etag.encode() + b"\n" + body,
+                settings.RESPONSE_CACHE_TTL_SECONDS,
+            )
+            self.stores += 1
+        except Exception:
+            logger.warning("Response cache backend failed", exc_info=True)
+            self.backend_errors += 1
+        return result
+
+    async def invalidate(self, *tags: str):
+        try:
+            for tag in tags:
+                await self.backend.bump(tag)
+            self.invalidations += 1
+        except Exception:
+            logger.warning("Response cache invalidation failed", exc_info=True)
+            self.backend_errors += 1
+
+    async def reset(self):
+        self.hits = self.misses = self.stores = 0
+        self.invalidations = self.backend_errors = 0
+        self._seen.clear()
+        await self.backend.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "invalidations": self.invalidations,
+            "backend_errors": self.backend_errors,
+            **self.backend.stats(),
+        }
+
+
+def _make_backend() -> ResponseCacheBackend:
+    if settings.RESPONSE_CACHE_BACKEND_URL:
+        return RedisResponseCacheBackend.from_url(
+            settings.RESPONSE_CACHE_BACKEND_URL
+        )
+    return MemoryResponseCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+response_cache = ResponseCache(_make_backend())
@@ -1,13 +1,30 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, UTC
 from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from hermanitto_docs_api.core.cache import LRUCache
 from hermanitto_docs_api.core.config import settings
 from typing import Optional
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+)
+# O bcrypt libera o GIL: um pool limitado de threads executa os hashes sem
+# bloquear o event loop e sem deixar uma rajada de logins ocupar todos os
+# núcleos.
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/users/login")
+# token -> claims já verificados; cada entrada expira junto com o `exp`
+token_cache = LRUCache(settings.TOKEN_CACHE_SIZE)
 
 
 def verify_password(plain_password, hashed_password):
@@ -18,8 +35,38 @@ def get_password_hash(password):
     return pwd_context.hash(password)
 
 
-def create_access_token(data: dict, expires_delta: Optional[int] = None):
+async def get_password_hash_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, pwd_context.hash, password
+    )
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    # Retorna (válida, novo_hash); novo_hash vem preenchido quando o hash
+    # armazenado usa parâmetros antigos (ex.: outro BCRYPT_ROUNDS).
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor,
+        pwd_context.verify_and_update,
+        plain_password,
+        hashed_password,
+    )
+
+
+def create_access_token(
+    data: dict, expires_delta: Optional[int] = None, user=None
+):
     to_encode = data.copy()
+    if user is not None:
+        # Dados imutáveis do usuário viram claims: /me não precisa do banco
+        to_encode.update(
+            sub=user.username,
+            uid=user.id,
+            created_at=user.created_at.isoformat(),
+        )
     expire = datetime.now(UTC) + timedelta(
         minutes=expires_delta or settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
@@ -30,19 +77,31 @@ def create_access_token(data: dict, expires_delta: Optional[int] = None):
     return encoded_jwt
 
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
+def _decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        username: str = payload.get("sub")
-        if username is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token",
-            )
-        return username
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         )
+    exp = payload.get("exp")
+    if exp is not None:
+        token_cache.set(token, payload, ttl=exp - time.time())
+    return payload
+
+
+async def get_token_claims(token: str = Depends(oauth2_scheme)) -> dict:
+    # Requisições repetidas com o mesmo token evitam o jwt.decode
+    return token_cache.get(token) or _decode_token(token)
+
+
+async def get_current_user(claims: dict = Depends(get_token_claims)):
+    username: str | None = claims.get("sub")
+    if username is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
+    return username
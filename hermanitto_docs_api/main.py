@@ -1,10 +1,101 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from hermanitto_docs_api import IMPORT_STARTED
+from hermanitto_docs_api.api import ops
 from hermanitto_docs_api.api.v1.endpoints import users, documents, types
+from hermanitto_docs_api.core.config import settings
+from hermanitto_docs_api.core.dependencies import (
+    SessionLocal,
+    engine,
+    read_engine,
+)
+from hermanitto_docs_api.core.metrics import (
+    MetricsMiddleware,
+    register_route_prefix,
+)
+from hermanitto_docs_api.core.query_stats import QueryStatsMiddleware
+from hermanitto_docs_api.core.readiness import open_connections, readiness
+from hermanitto_docs_api.core.security import get_password_hash_async
+from hermanitto_docs_api.services.archive_service import ensure_partitions
+from hermanitto_docs_api.services.type_cache import type_cache
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
 
-app.include_router(users.router, prefix="/api/v1/users", tags=["users"])
-app.include_router(
-    documents.router, prefix="/api/v1/documents", tags=["documents"]
-)
-app.include_router(types.router, prefix="/api/v1/types", tags=["types"])
+
+async def warm_up(engine, session_factory, read_engine=None):
+    """Open pool connections, prime the type cache and load bcrypt.
+
+    Also creates the upcoming monthly partitions of `documents`, when
+    it is partitioned (best effort: the maintenance job does it too).
+    """
+    await open_connections(engine, settings.WARMUP_DB_CONNECTIONS)
+    if read_engine is not None:
+        # A réplica é opcional (get_read_db cai no primário): não bloqueia
+        try:
+            await open_connections(read_engine, settings.WARMUP_DB_CONNECTIONS)
+        except Exception:
+            logger.warning("Read replica warm-up failed", exc_info=True)
+    async with session_factory() as db:
+        await type_cache.list(db)
+        try:
+            await ensure_partitions(db)
+        except Exception:
+            # Outro worker pode estar criando a mesma partição
+            await db.rollback()
+            logger.warning("Partition maintenance failed", exc_info=True)
+    # Carrega o backend do bcrypt e sobe a thread do executor de hashes
+    await get_password_hash_async("warm-up")
+
+
+async def warm_up_until_ready(engine, session_factory, read_engine=None):
+    # Em segundo plano: /healthz responde já; /readyz só após o
+    # aquecimento, repetido enquanto o banco não aceita conexões
+    while True:
+        readiness.attempts += 1
+        start = time.perf_counter()
+        try:
+            await warm_up(engine, session_factory, read_engine)
+        except Exception as exc:
+            readiness.error = type(exc).__name__
+            logger.warning(
+                "Warm-up failed, retrying in %ss",
+                settings.WARMUP_RETRY_SECONDS,
+                exc_info=True,
+            )
+            await asyncio.sleep(settings.WARMUP_RETRY_SECONDS)
+        else:
+            readiness.mark_ready(IMPORT_STARTED, time.perf_counter() - start)
+            return
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    task = asyncio.create_task(
+        warm_up_until_ready(engine, SessionLocal, read_engine)
+    )
+    yield
+    # Desligamento: o servidor já esperou as requisições em andamento;
+    # fecha as conexões dos pools em vez de deixá-las cair com o processo
+    task.cancel()
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+for router, prefix, tag in (
+    (users.router, "/api/v1/users", "users"),
+    (documents.router, "/api/v1/documents", "documents"),
+    (types.router, "/api/v1/types", "types"),
+    (ops.router, "", "ops"),
+):
+    app.include_router(router, prefix=prefix, tags=[tag])
+    register_route_prefix(router, prefix)
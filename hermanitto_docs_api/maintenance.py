@@ -0,0 +1,75 @@
+"""Maintenance jobs for the documents table.
+
+    hermanitto-docs-maintenance partitions
+    python -m hermanitto_docs_api.maintenance archive --before 2025-01-01
+
+`partitions` creates the monthly partitions of `documents` for the
+current month and DOCUMENTS_PARTITION_MONTHS_AHEAD months after it
+(PostgreSQL). `archive` moves the documents created before the cutoff
+(default: DOCUMENTS_RETENTION_MONTHS full months ago) to
+documents_archive. Both are idempotent; schedule them with cron.
+"""
+
+import argparse
+import asyncio
+import json
+from datetime import datetime
+
+from hermanitto_docs_api.core.config import settings
+from hermanitto_docs_api.core.dependencies import SessionLocal, engine
+from hermanitto_docs_api.services.archive_service import (
+    archive_documents,
+    ensure_partitions,
+    retention_cutoff,
+)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    partitions = commands.add_parser(
+        "partitions", help="create the upcoming monthly partitions"
+    )
+    partitions.add_argument(
+        "--months-ahead",
+        type=int,
+        default=settings.DOCUMENTS_PARTITION_MONTHS_AHEAD,
+    )
+    archive = commands.add_parser(
+        "archive", help="move old documents to documents_archive"
+    )
+    archive.add_argument(
+        "--before",
+        type=datetime.fromisoformat,
+        default=None,
+        help="archive documents created before this date "
+        "(default: DOCUMENTS_RETENTION_MONTHS ago)",
+    )
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace, session_factory) -> dict:
+    async with session_factory() as db:
+        if args.command == "partitions":
+            return {"created": await ensure_partitions(db, args.months_ahead)}
+        before = args.before or retention_cutoff()
+        if before is None:
+            # Sem data e sem retenção configurada: nada a arquivar
+            return {"archived": 0, "partitions": [], "batches": 0}
+        return await archive_documents(db, before)
+
+
+async def _run_and_dispose(args: argparse.Namespace) -> dict:
+    try:
+        return await run(args, SessionLocal)
+    finally:
+        await engine.dispose()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(json.dumps(asyncio.run(_run_and_dispose(args))))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
-from sqlalchemy import String, Integer, DateTime, ForeignKey
+from sqlalchemy import DDL, String, Integer, DateTime, Float, ForeignKey
+from sqlalchemy import Column, Index, PrimaryKeyConstraint, Table
+from sqlalchemy import event
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 from datetime import datetime
 from hermanitto_docs_api.models.base import Base
@@ -6,6 +8,23 @@ from hermanitto_docs_api.models.base import Base
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        # Suporta a paginação por cursor (keyset) em list_documents
+        Index("ix_documents_created_at_id", "created_at", "id"),
+        # Filtros por tipo (na ordem da paginação) e por updated_at
+        Index(
+            "ix_documents_type_id_created_at_id", "type_id", "created_at", "id"
+        ),
+        Index("ix_documents_updated_at_id", "updated_at", "id"),
+        # Busca por trecho do link (search_documents); no SQLite a busca
+        # usa a tabela FTS5 documents_fts, criada abaixo
+        Index(
+            "ix_documents_link_trgm",
+            "link",
+            postgresql_using="gin",
+            postgresql_ops={"link": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     type_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("document_types.id")
@@ -17,4 +36,83 @@ class Document(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    # Resultado da última verificação do link (services/link_checker.py)
+    link_status: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    link_latency_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    link_error: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    last_checked_at: Mapped[datetime | None] = mapped_column(
+        DateTime, nullable=True
+    )
     type = relationship("DocumentType")
+
+
+# Documentos arquivados (services/archive_service.py): mesmas colunas, fora
+# das leituras padrão. No PostgreSQL documents é particionada por mês em
+# created_at (migração 4f8a2d6c9e15) e as partições antigas são anexadas
+# aqui como estão; a chave primária inclui a chave de partição.
+documents_archive = Table(
+    "documents_archive",
+    Base.metadata,
+    Column("id", Integer, nullable=False),
+    Column("type_id", Integer, nullable=False),
+    Column("link", String(255), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    Column("link_status", Integer, nullable=True),
+    Column("link_latency_ms", Float, nullable=True),
+    Column("link_error", String(255), nullable=True),
+    Column("last_checked_at", DateTime, nullable=True),
+    PrimaryKeyConstraint("id", "created_at"),
+    Index("ix_documents_archive_created_at_id", "created_at", "id"),
+    postgresql_partition_by="RANGE (created_at)",
+)
+
+
+# Tabela FTS5 (tokenizador trigram) espelhando documents.link, mantida
+# por triggers. External content: o texto não é duplicado, só o índice.
+SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE documents_fts USING fts5("
+    "link, content='documents', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER documents_fts_ai AFTER INSERT ON documents BEGIN "
+    "INSERT INTO documents_fts(rowid, link) VALUES (new.id, new.link); "
+    "END",
+    "CREATE TRIGGER documents_fts_ad AFTER DELETE ON documents BEGIN "
+    "INSERT INTO documents_fts(documents_fts, rowid, link) "
+    "VALUES ('delete', old.id, old.link); "
+    "END",
+    "CREATE TRIGGER documents_fts_au AFTER UPDATE OF link ON documents "
+    "BEGIN "
+    "INSERT INTO documents_fts(documents_fts, rowid, link) "
+    "VALUES ('delete', old.id, old.link); "
+    "INSERT INTO documents_fts(rowid, link) VALUES (new.id, new.link); "
+    "END",
+)
+
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(
+        dialect="postgresql"
+    ),
+)
+for statement in SQLITE_FTS_DDL:
+    event.listen(
+        Document.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
+# Partição padrão: recebe as linhas movidas uma a uma (fora das partições
+# mensais), como quando documents não é particionada
+event.listen(
+    documents_archive,
+    "after_create",
+    DDL(
+        "CREATE TABLE documents_archive_default "
+        "PARTITION OF documents_archive DEFAULT"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Document.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS documents_fts").execute_if(dialect="sqlite"),
+)
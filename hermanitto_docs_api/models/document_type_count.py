@@ -0,0 +1,15 @@
+from sqlalchemy import Integer, ForeignKey
+from sqlalchemy.orm import mapped_column, Mapped
+from hermanitto_docs_api.models.base import Base
+
+
+class DocumentTypeCount(Base):
+    # Total de documentos por tipo, mantido pelos serviços na mesma
+    # transação que insere (ou remove) documentos.
+    __tablename__ = "document_type_counts"
+    type_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("document_types.id"), primary_key=True
+    )
+    document_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
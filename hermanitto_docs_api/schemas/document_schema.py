@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from datetime import datetime
+from pydantic import BaseModel, field_validator
+from datetime import datetime, UTC
 
 
 class DocumentCreate(BaseModel):
@@ -16,3 +16,75 @@ class DocumentOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class DocumentFilters(BaseModel):
+    type_ids: list[int] = []
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    updated_from: datetime | None = None
+    updated_to: datetime | None = None
+
+    @field_validator(
+        "created_from", "created_to", "updated_from", "updated_to"
+    )
+    @classmethod
+    def to_naive_utc(cls, value: datetime | None):
+        # As colunas guardam UTC sem fuso
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(UTC).replace(tzinfo=None)
+        return value
+
+
+class DocumentPage(BaseModel):
+    items: list[DocumentOut]
+    next_cursor: str | None = None
+
+
+class DocumentBulkError(BaseModel):
+    index: int
+    detail: str
+
+
+class DocumentBulkResult(BaseModel):
+    created: list[DocumentOut]
+    errors: list[DocumentBulkError]
+
+
+class DocumentImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class DocumentImportResult(BaseModel):
+    total: int
+    imported: int
+    failed: int
+    batches: int
+    errors: list[DocumentImportError]
+
+
+class LinkCheckStatus(BaseModel):
+    running: bool
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    checked: int
+    broken: int
+    error: str | None = None
+
+
+class LinkCheckResult(BaseModel):
+    id: int
+    link: str
+    link_status: int | None = None
+    link_latency_ms: float | None = None
+    link_error: str | None = None
+    last_checked_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class LinkCheckResultPage(BaseModel):
+    items: list[LinkCheckResult]
+    next_cursor: int | None = None
@@ -11,3 +11,9 @@ class DocumentTypeOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class DocumentTypeStats(BaseModel):
+    id: int
+    name: str
+    document_count: int
@@ -0,0 +1,118 @@
+"""Production server for the API.
+
+    hermanitto-docs-api --workers 4
+    python -m hermanitto_docs_api.server --port 8080
+
+Runs uvicorn without the file watcher, with one worker per CPU by
+default and uvloop/httptools when they are installed. On SIGTERM each
+worker stops accepting connections, waits up to
+SERVER_GRACEFUL_SHUTDOWN_SECONDS for in-flight requests and then closes
+its database pools (lifespan in main.py).
+"""
+
+import argparse
+import importlib.util
+import os
+
+import uvicorn
+
+from hermanitto_docs_api.core.config import settings
+
+APP = "hermanitto_docs_api.main:app"
+
+
+def cpu_count() -> int:
+    # CPUs que o processo pode usar (respeita cpuset de containers)
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def server_options(args: argparse.Namespace) -> dict:
+    """Keyword arguments for uvicorn.run() from the parsed arguments."""
+    workers = args.workers or cpu_count()
+    return {
+        "host": args.host,
+        "port": args.port,
+        "workers": workers,
+        "loop": "uvloop" if _available("uvloop") else "asyncio",
+        "http": "httptools" if _available("httptools") else "h11",
+        "backlog": args.backlog,
+        "timeout_keep_alive": args.keepalive,
+        "timeout_graceful_shutdown": args.graceful_shutdown,
+        "access_log": args.access_log,
+        # A API não tem websockets: não carrega o protocolo
+        "ws": "none",
+        "proxy_headers": True,
+        "forwarded_allow_ips": args.forwarded_allow_ips,
+    }
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.SERVER_WORKERS,
+        help="worker processes (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--backlog",
+        type=int,
+        default=settings.SERVER_BACKLOG,
+        help="pending connections queued by the kernel",
+    )
+    parser.add_argument(
+        "--keepalive",
+        type=int,
+        default=settings.SERVER_KEEPALIVE_SECONDS,
+        help="seconds an idle keep-alive connection stays open",
+    )
+    parser.add_argument(
+        "--graceful-shutdown",
+        type=int,
+        default=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        help="seconds to wait for in-flight requests on shutdown",
+    )
+    parser.add_argument(
+        "--access-log",
+        action=argparse.BooleanOptionalAction,
+        default=settings.SERVER_ACCESS_LOG,
+    )
+    parser.add_argument(
+        "--forwarded-allow-ips",
+        default=None,
+        help="proxies trusted for X-Forwarded-* (default: 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--preload",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="import the app before starting workers",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    options = server_options(args)
+    app = APP
+    if args.preload:
+        # Importa o app no processo principal: erros de configuração e de
+        # importação aparecem antes de subir os workers. Com um worker, o
+        # próprio objeto é servido e não há segunda importação.
+        from hermanitto_docs_api.main import app as loaded
+
+        if options["workers"] == 1:
+            app = loaded
+    uvicorn.run(app, **options)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import re
+from collections import Counter
+from datetime import datetime, UTC
+from sqlalchemy import delete, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from hermanitto_docs_api.core.config import settings
+from hermanitto_docs_api.core.response_cache import response_cache
+from hermanitto_docs_api.models.document import Document, documents_archive
+from hermanitto_docs_api.services.type_service import add_document_counts
+
+# documents_pAAAAMM cobre [dia 1 do mês, dia 1 do mês seguinte); linhas
+# fora das partições mensais caem em documents_default
+PARTITION_NAME = re.compile(r"^documents_p(\d{4})(\d{2})$")
+
+
+def month_start(moment: datetime) -> datetime:
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def monthly_partitions(first: datetime, last: datetime):
+    """Yield (name, start, end) for each month from `first` to `last`."""
+    month = month_start(first)
+    while month <= last:
+        end = add_months(month, 1)
+        yield f"documents_p{month:%Y%m}", month, end
+        month = end
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def retention_cutoff(now: datetime | None = None) -> datetime | None:
+    # Mantém o mês corrente e DOCUMENTS_RETENTION_MONTHS meses completos
+    if settings.DOCUMENTS_RETENTION_MONTHS <= 0:
+        return None
+    current = month_start(now or _utcnow())
+    return add_months(current, -settings.DOCUMENTS_RETENTION_MONTHS)
+
+
+async def is_partitioned(db: AsyncSession, table: str = "documents") -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    relkind = await db.scalar(
+        text("SELECT relkind::text FROM pg_class WHERE oid = to_regclass(:t)"),
+        {"t": table},
+    )
+    return relkind == "p"
+
+
+async def _attach(
+    db: AsyncSession,
+    parent: str,
+    name: str,
+    start: datetime,
+    end: datetime,
+):
+    # Linhas do intervalo que estejam na partição padrão do pai vão antes
+    # para a tabela anexada: o ATTACH falharia com elas lá
+    await db.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {parent}_default "
+            "WHERE created_at >= :start AND created_at < :end RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"start": start, "end": end},
+    )
+    await db.execute(
+        text(
+            f"ALTER TABLE {parent} ATTACH PARTITION {name} FOR VALUES "
+            f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    )
+
+
+async def ensure_partitions(
+    db: AsyncSession,
+    months_ahead: int | None = None,
+    now: datetime | None = None,
+) -> list[str]:
+    """Create the missing monthly partitions of `documents`.
+
+    Covers the current month and DOCUMENTS_PARTITION_MONTHS_AHEAD months
+    after it, one commit per partition, and returns the names created.
+    Does nothing unless `documents` is partitioned (PostgreSQL).
+    """
+    if not await is_partitioned(db):
+        return []
+    if months_ahead is None:
+        months_ahead = settings.DOCUMENTS_PARTITION_MONTHS_AHEAD
+    current = month_start(now or _utcnow())
+    created = []
+    for name, start, end in monthly_partitions(
+        current, add_months(current, months_ahead)
+    ):
+        exists = await db.scalar(
+            text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}
+        )
+        if exists:
+            continue
+        await db.execute(
+            text(
+                f"CREATE TABLE {name} "
+                "(LIKE documents INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+        )
+        await _attach(db, "documents", name, start, end)
+        await db.commit()
+        created.append(name)
+    return created
+
+
+async def _monthly_partitions_of(db: AsyncSession, parent: str):
+    result = await db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:parent)"
+        ),
+        {"parent": parent},
+    )
+    partitions = []
+    for name in result.scalars():
+        match = PARTITION_NAME.match(name)
+        if match:
+            start = datetime(int(match[1]), int(match[2]), 1)
+            partitions.append((name, start, add_months(start, 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def _removed(counts: Counter) -> Counter:
+    # Deltas negativos (o - unário do Counter descartaria os valores)
+    return Counter({type_id: -n for type_id, n in counts.items()})
+
+
+async def _archive_partition(
+    db: AsyncSession, name: str, start: datetime, end: datetime
+) -> int:
+    # Só metadados: a partição passa de documents para documents_archive
+    # sem copiar linhas. O DETACH toma ACCESS EXCLUSIVE em documents até
+    # o commit: espera as transações abertas (ex.: uma exportação em
+    # andamento) e, enquanto espera, toda leitura de documents fica na
+    # fila atrás dele. DETACH ... CONCURRENTLY não serve: o PostgreSQL o
+    # recusa quando o pai tem partição padrão (documents_default).
+    result = await db.execute(
+        text(f"SELECT type_id, count(*) FROM {name} GROUP BY type_id")
+    )
+    counts: Counter[int] = Counter(dict(result.all()))
+    await db.execute(text(f"ALTER TABLE documents DETACH PARTITION {name}"))
+    await _attach(db, "documents_archive", name, start, end)
+    await add_document_counts(db, _removed(counts))
+    await db.commit()
+    return counts.total()
+
+
+async def _archive_batch(db: AsyncSession, before: datetime) -> int:
+    table = Document.__table__
+    ids = (
+        await db.scalars(
+            select(table.c.id)
+            .where(table.c.created_at < before)
+            .order_by(table.c.created_at, table.c.id)
+            .limit(settings.DOCUMENTS_ARCHIVE_BATCH_SIZE)
+        )
+    ).all()
+    if not ids:
+        return 0
+    # created_at repetido no filtro: restringe às partições antigas
+    chosen = table.c.id.in_(ids) & (table.c.created_at < before)
+    await db.execute(
+        insert(documents_archive).from_select(
+            list(table.c.keys()), select(table).where(chosen)
+        )
+    )
+    result = await db.scalars(
+        delete(table).where(chosen).returning(table.c.type_id)
+    )
+    await add_document_counts(db, _removed(Counter(result.all())))
+    await db.commit()
+    return len(ids)
+
+
+async def archive_documents(db: AsyncSession, before: datetime) -> dict:
+    """Move the documents created before `before` to documents_archive.
+
+    On a partitioned `documents`, monthly partitions that end by
+    `before` are detached and attached to documents_archive whole.
+    Anything left (other databases, rows in the default partition) is
+    moved in batches of DOCUMENTS_ARCHIVE_BATCH_SIZE rows. Each step
+    commits on its own, together with the per-type count deltas.
+    """
+    archived: int = 0
+    partitions: list[str] = []
+    batches: int = 0
+    if await is_partitioned(db):
+        for name, start, end in await _monthly_partitions_of(db, "documents"):
+            if end > before:
+                break
+            archived += await _archive_partition(db, name, start, end)
+            partitions.append(name)
+    while moved := await _archive_batch(db, before):
+        archived += moved
+        batches += 1
+    if archived:
+        await response_cache.invalidate("documents")
+    return {"archived": archived, "partitions": partitions, "batches": batches}
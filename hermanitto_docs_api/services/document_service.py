@@ -1,26 +1,449 @@
-from hermanitto_docs_api.models.document import Document
-from hermanitto_docs_api.models.document_type import DocumentType
+import base64
+import binascii
+import codecs
+import csv
+import io
+import json
+from collections import Counter
+from datetime import datetime, UTC
+from hermanitto_docs_api.models.document import Document, documents_archive
+from hermanitto_docs_api.models.document_type_count import DocumentTypeCount
+from sqlalchemy import column, func, insert, inspect, literal_column, table
+from sqlalchemy import tuple_, union_all
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from hermanitto_docs_api.schemas.document_schema import DocumentCreate
-from fastapi import HTTPException
+from sqlalchemy.orm import aliased
+from hermanitto_docs_api.core.config import settings
+from hermanitto_docs_api.core.query_stats import quiet_repeated_queries
+from hermanitto_docs_api.core.response_cache import response_cache
+from hermanitto_docs_api.schemas.document_schema import (
+    DocumentCreate,
+    DocumentFilters,
+)
+from hermanitto_docs_api.services.type_cache import type_cache
+from hermanitto_docs_api.services.type_service import add_document_counts
+from fastapi import HTTPException, status
+
+EXPORT_COLUMNS = ("id", "type_id", "link", "created_at", "updated_at")
+IMPORT_COLUMNS = ("type_id", "link", "created_at", "updated_at")
+# Bytes lidos do upload por vez
+IMPORT_READ_SIZE = 64 * 1024
+# Índices de trigramas só ajudam com termos de 3+ caracteres
+SEARCH_MIN_LENGTH = 3
+
+documents_fts = table("documents_fts", column("rowid"), column("rank"))
+
+
+def _encode_cursor(doc: Document) -> str:
+    raw = json.dumps([doc.created_at.isoformat(), doc.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, doc_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(created_at), int(doc_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def _is_type_fk_violation(exc: IntegrityError) -> bool:
+    # PostgreSQL: foreign_key_violation (23503) em documents_type_id_fkey.
+    # O SQLite não dá o nome da restrição, mas documents só tem essa FK.
+    orig = exc.orig
+    if getattr(orig, "sqlstate", None) == "23503":
+        return "type_id" in str(orig)
+    return "FOREIGN KEY constraint failed" in str(orig)
 
 
 async def create_document(db: AsyncSession, doc_in: DocumentCreate):
-    # Verifica se o tipo existe
-    result = await db.execute(
-        select(DocumentType).where(DocumentType.id == doc_in.type_id)
-    )
-    doc_type = result.scalar_one_or_none()
-    if not doc_type:
+    # Um INSERT ... RETURNING devolve a linha completa (sem refresh); a
+    # chave estrangeira valida o tipo, sem consulta prévia
+    try:
+        doc = await db.scalar(
+            insert(Document)
+            .values(type_id=doc_in.type_id, link=doc_in.link)
+            .returning(Document)
+        )
+    except IntegrityError as exc:
+        await db.rollback()
+        if not _is_type_fk_violation(exc):
+            raise
         raise HTTPException(status_code=404, detail="Document type not found")
-    doc = Document(type_id=doc_in.type_id, link=doc_in.link)
-    db.add(doc)
+    await add_document_counts(db, Counter([doc_in.type_id]))
     await db.commit()
-    await db.refresh(doc)
+    await response_cache.invalidate("documents")
     return doc
 
 
-async def list_documents(db: AsyncSession):
-    result = await db.execute(select(Document))
-    return result.scalars().all()
+async def create_documents_bulk(
+    db: AsyncSession, docs_in: list[DocumentCreate]
+):
+    if len(docs_in) > settings.DOCUMENTS_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Too many documents in a single request",
+        )
+    # Valida todos os tipos distintos do lote de uma vez (no máximo uma
+    # consulta, quando o cache não cobre todos os ids)
+    valid_type_ids = set()
+    if docs_in:
+        valid_type_ids = set(
+            await type_cache.get_many(db, {d.type_id for d in docs_in})
+        )
+
+    max_link_length = Document.__table__.c.link.type.length
+    rows, errors = [], []
+    for index, doc_in in enumerate(docs_in):
+        if doc_in.type_id not in valid_type_ids:
+            errors.append(
+                {"index": index, "detail": "Document type not found"}
+            )
+        elif len(doc_in.link) > max_link_length:
+            errors.append({"index": index, "detail": "Link too long"})
+        else:
+            rows.append({"type_id": doc_in.type_id, "link": doc_in.link})
+
+    created = []
+    if rows:
+        # INSERT em lote com RETURNING: um commit para o lote inteiro; as
+        # linhas voltam na ordem da entrada
+        result = await db.scalars(
+            insert(Document).returning(Document, sort_by_parameter_order=True),
+            rows,
+        )
+        created = list(result.all())
+        await add_document_counts(db, Counter(r["type_id"] for r in rows))
+        await db.commit()
+        await response_cache.invalidate("documents")
+    return {"created": created, "errors": errors}
+
+
+def _line_too_long(limit: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Lines must be at most {limit} characters",
+    )
+
+
+async def _iter_lines(file):
+    # Lê o upload em blocos e devolve linhas completas: a memória fica
+    # limitada a um bloco mais a linha em andamento, que não passa de
+    # DOCUMENTS_IMPORT_MAX_LINE_LENGTH (arquivo sem quebras vira 400).
+    limit = settings.DOCUMENTS_IMPORT_MAX_LINE_LENGTH
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    try:
+        while chunk := await file.read(IMPORT_READ_SIZE):
+            lines = decoder.decode(chunk).split("\n")
+            # Só a linha em andamento é concatenada, não o bloco inteiro
+            lines[0] = pending + lines[0]
+            pending = lines.pop()
+            if len(pending) > limit:
+                raise _line_too_long(limit)
+            for line in lines:
+                if len(line) > limit:
+                    raise _line_too_long(limit)
+                yield line
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be UTF-8 encoded",
+        )
+    if pending:
+        yield pending
+
+
+def _parse_csv(line: str):
+    fields = next(csv.reader([line]))
+    if len(fields) != 2:
+        raise ValueError
+    type_id, link = fields
+    return int(type_id), link
+
+
+def _parse_jsonl(line: str):
+    # strict: sem coerção (1.9, true, null ou números no link são linhas
+    # inválidas); ValidationError é um ValueError
+    item = DocumentCreate.model_validate_json(line, strict=True)
+    return item.type_id, item.link
+
+
+async def _copy_documents(db: AsyncSession, rows: list[tuple]):
+    # COPY pelo driver asyncpg, na transação já aberta pela sessão
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    driver = raw.driver_connection
+    if driver is None:
+        raise RuntimeError("Connection is closed")
+    await driver.copy_records_to_table(
+        Document.__tablename__, records=rows, columns=IMPORT_COLUMNS
+    )
+
+
+async def _insert_import_batch(db: AsyncSession, pairs: list[tuple]):
+    now = datetime.now(UTC).replace(tzinfo=None)
+    rows = [(type_id, link, now, now) for type_id, link in pairs]
+    # Os contadores vão antes: no asyncpg é o primeiro statement que abre
+    # a transação em que o COPY também roda.
+    await add_document_counts(db, Counter(row[0] for row in rows))
+    if db.get_bind().dialect.driver == "asyncpg":
+        await _copy_documents(db, rows)
+    else:
+        await db.execute(
+            insert(Document.__table__),
+            [dict(zip(IMPORT_COLUMNS, row)) for row in rows],
+        )
+    await db.commit()
+    await response_cache.invalidate("documents")
+
+
+async def import_documents(db: AsyncSession, file, fmt: str):
+    """Import `type_id,link` rows from a CSV or JSONL upload.
+
+    The file is read incrementally and loaded in batches of
+    DOCUMENTS_IMPORT_BATCH_SIZE rows, each committed on its own, so
+    memory stays bounded whatever the file size. Invalid rows are
+    skipped and reported (up to DOCUMENTS_IMPORT_MAX_ERRORS of them).
+    """
+    parse = _parse_csv if fmt == "csv" else _parse_jsonl
+    # Um INSERT (ou COPY) por lote é esperado aqui, não um N+1
+    quiet_repeated_queries()
+    # Tipos carregados uma vez; cada linha é validada contra o conjunto
+    valid_type_ids = {t.id for t in await type_cache.list(db)}
+    reloaded = False
+    max_link_length = Document.__table__.c.link.type.length
+    batch_size = settings.DOCUMENTS_IMPORT_BATCH_SIZE
+    summary = {"total": 0, "imported": 0, "failed": 0, "batches": 0}
+    errors: list[dict] = []
+
+    def reject(line_number: int, detail: str):
+        summary["failed"] += 1
+        if len(errors) < settings.DOCUMENTS_IMPORT_MAX_ERRORS:
+            errors.append({"line": line_number, "detail": detail})
+
+    rows = []
+    line_number = 0
+    async for line in _iter_lines(file):
+        line_number += 1
+        line = line.strip()
+        if not line:
+            continue
+        if line_number == 1 and fmt == "csv" and line == "type_id,link":
+            continue
+        summary["total"] += 1
+        try:
+            type_id, link = parse(line)
+        except (ValueError, TypeError, KeyError):
+            reject(line_number, "Invalid row")
+            continue
+        if type_id not in valid_type_ids and not reloaded:
+            # Id desconhecido: o tipo pode ter sido criado depois da carga
+            # do cache (como em get_many). Recarrega uma vez por arquivo.
+            reloaded = True
+            if await type_cache.get_by_id(db, type_id) is not None:
+                valid_type_ids = {t.id for t in await type_cache.list(db)}
+        if type_id not in valid_type_ids:
+            reject(line_number, "Document type not found")
+        elif not link:
+            reject(line_number, "Missing link")
+        elif len(link) > max_link_length:
+            reject(line_number, "Link too long")
+        else:
+            rows.append((type_id, link))
+        if len(rows) >= batch_size:
+            await _insert_import_batch(db, rows)
+            summary["imported"] += len(rows)
+            summary["batches"] += 1
+            rows = []
+    if rows:
+        await _insert_import_batch(db, rows)
+        summary["imported"] += len(rows)
+        summary["batches"] += 1
+    return {**summary, "errors": errors}
+
+
+def _documents_source(include_archived: bool):
+    # Com include_archived, documents UNION ALL documents_archive mapeada
+    # como Document: os filtros, a ordenação e o cursor são os mesmos
+    if not include_archived:
+        return Document
+    active = Document.__table__
+    archived = select(*(documents_archive.c[c.key] for c in active.c))
+    return aliased(
+        Document, union_all(select(active), archived).subquery("documents")
+    )
+
+
+def filter_documents(query, filters: DocumentFilters | None, source=Document):
+    # Cada filtro tem um índice de apoio: (type_id, created_at, id) e
+    # (updated_at, id); o intervalo de created_at usa (created_at, id)
+    # e, na tabela particionada, descarta as partições fora dele.
+    if filters is None:
+        return query
+    if filters.type_ids:
+        query = query.where(source.type_id.in_(filters.type_ids))
+    if filters.created_from is not None:
+        query = query.where(source.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        query = query.where(source.created_at < filters.created_to)
+    if filters.updated_from is not None:
+        query = query.where(source.updated_at >= filters.updated_from)
+    if filters.updated_to is not None:
+        query = query.where(source.updated_at < filters.updated_to)
+    return query
+
+
+async def documents_version(db: AsyncSession) -> str:
+    # A soma de document_type_counts muda a cada inserção e arquivamento,
+    # mesmo quando transações concorrentes fazem commit fora da ordem dos
+    # ids; max(updated_at) muda a cada edição. Uma linha por tipo e um
+    # índice: sem contar os documentos.
+    total = select(
+        func.coalesce(func.sum(DocumentTypeCount.document_count), 0)
+    ).scalar_subquery()
+    result = await db.execute(
+        select(total, func.max(Document.id), func.max(Document.updated_at))
+    )
+    return "-".join(
+        value.isoformat() if isinstance(value, datetime) else str(value)
+        for value in result.one()
+    )
+
+
+def _select_documents(rows: bool, source=Document):
+    # rows=True devolve linhas (Row) em vez de entidades do ORM: evita
+    # montar objetos e o identity map quando o resultado só será lido.
+    return select(inspect(source).selectable if rows else source)
+
+
+def _fetch(result, rows: bool) -> list:
+    return list(result.all() if rows else result.scalars().all())
+
+
+async def list_documents(
+    db: AsyncSession,
+    limit: int,
+    cursor: str | None = None,
+    filters: DocumentFilters | None = None,
+    rows: bool = False,
+    include_archived: bool = False,
+):
+    # Paginação keyset em (created_at, id): o custo de cada página não
+    # depende da profundidade, ao contrário de OFFSET. Na tabela
+    # particionada por created_at, a ordem é a das partições: a página
+    # lê só as primeiras que alcançar (append ordenado com LIMIT).
+    source = _documents_source(include_archived)
+    query = filter_documents(
+        _select_documents(rows, source).order_by(source.created_at, source.id),
+        filters,
+        source,
+    )
+    if cursor:
+        created_at, doc_id = _decode_cursor(cursor)
+        # created_at >= também em separado: a comparação de tupla não
+        # descarta partições, a condição simples sim
+        query = query.where(
+            source.created_at >= created_at,
+            tuple_(source.created_at, source.id) > tuple_(created_at, doc_id),
+        )
+    result = await db.execute(query.limit(limit + 1))
+    docs = _fetch(result, rows)
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = _encode_cursor(docs[-1])
+    return {"items": docs, "next_cursor": next_cursor}
+
+
+def _like_pattern(q: str) -> str:
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+async def search_documents(
+    db: AsyncSession, q: str, limit: int, rows: bool = False
+):
+    # Busca por trecho do link. PostgreSQL: ILIKE atendido pelo índice GIN
+    # pg_trgm, ordenado por similaridade. SQLite: tabela FTS5 trigram,
+    # ordenada por bm25. Em ambos o custo segue o número de ocorrências.
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        phrase = '"' + q.replace('"', '""') + '"'
+        query = (
+            _select_documents(rows)
+            .join(documents_fts, documents_fts.c.rowid == Document.id)
+            .where(literal_column("documents_fts").op("MATCH")(phrase))
+            .order_by(documents_fts.c.rank, Document.id)
+        )
+    else:
+        query = _select_documents(rows).where(
+            Document.link.ilike(_like_pattern(q), escape="\\")
+        )
+        if dialect == "postgresql":
+            query = query.order_by(
+                func.similarity(Document.link, q).desc(), Document.id
+            )
+        else:
+            query = query.order_by(Document.id)
+    result = await db.execute(query.limit(limit))
+    return _fetch(result, rows)
+
+
+def _ndjson_chunk(rows) -> str:
+    return "".join(
+        json.dumps(
+            {
+                "id": row.id,
+                "type_id": row.type_id,
+                "link": row.link,
+                "created_at": row.created_at.isoformat(),
+                "updated_at": row.updated_at.isoformat(),
+            }
+        )
+        + "\n"
+        for row in rows
+    )
+
+
+def _csv_chunk(rows) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(
+            [
+                row.id,
+                row.type_id,
+                row.link,
+                row.created_at.isoformat(),
+                row.updated_at.isoformat(),
+            ]
+        )
+    return buffer.getvalue()
+
+
+async def export_documents(
+    db: AsyncSession, fmt: str, chunk_size: int, include_archived=False
+):
+    # Lê por cursor do servidor (yield_per) e seleciona só as colunas, sem
+    # montar objetos ORM: a memória fica limitada a um bloco por vez.
+    source = _documents_source(include_archived)
+    query = (
+        select(*(getattr(source, column) for column in EXPORT_COLUMNS))
+        .order_by(source.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    if fmt == "csv":
+        render = _csv_chunk
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue()
+    else:
+        render = _ndjson_chunk
+    result = await db.stream(query)
+    async for rows in result.partitions():
+        yield render(rows)
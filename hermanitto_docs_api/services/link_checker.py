@@ -0,0 +1,258 @@
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from collections import defaultdict
+from datetime import datetime, UTC
+import httpx
+from sqlalchemy import bindparam, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from hermanitto_docs_api.core.config import settings
+from hermanitto_docs_api.models.document import Document
+
+logger = logging.getLogger(__name__)
+
+# Servidores que não implementam HEAD: repete com GET
+HEAD_NOT_SUPPORTED = {405, 501}
+ALLOWED_SCHEMES = {"http", "https"}
+
+
+class BlockedLinkError(ValueError):
+    pass
+
+
+def _is_public(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%")[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+async def ensure_public(url: httpx.URL):
+    """Raise BlockedLinkError unless `url` is http(s) to public hosts.
+
+    Every address the host resolves to must be public: private,
+    loopback, link-local (169.254.169.254) and reserved ones are
+    refused, so stored links cannot reach internal services.
+    """
+    if url.scheme not in ALLOWED_SCHEMES:
+        raise BlockedLinkError(f"scheme {url.scheme!r} not allowed")
+    port = url.port or (443 if url.scheme == "https" else 80)
+    infos = await asyncio.get_running_loop().getaddrinfo(
+        url.host, port, type=socket.SOCK_STREAM
+    )
+    for *_, sockaddr in infos:
+        address = str(sockaddr[0])
+        if not _is_public(address):
+            raise BlockedLinkError(f"{url.host} resolves to {address}")
+
+
+async def _guard_request(request: httpx.Request):
+    # Hook do cliente: vale também para cada redirecionamento seguido
+    if not settings.LINK_CHECK_ALLOW_PRIVATE:
+        await ensure_public(request.url)
+
+
+class HostLimiter:
+    # Limita as requisições simultâneas no total e por host, para não
+    # sobrecarregar um mesmo servidor quando muitos links apontam para ele.
+
+    def __init__(self, concurrency: int, per_host: int):
+        self._global = asyncio.Semaphore(concurrency)
+        self._hosts: dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(per_host)
+        )
+
+    async def run(self, host: str, coro_fn):
+        # O host primeiro: quem espera um host lotado não ocupa vaga global
+        async with self._hosts[host]:
+            async with self._global:
+                return await coro_fn()
+
+
+async def check_link(client: httpx.AsyncClient, limiter: HostLimiter, link):
+    """HEAD `link` (GET when HEAD is not supported) and time it.
+
+    Returns a dict with `link_status`, `link_latency_ms` and
+    `link_error`; errors are recorded, not raised.
+    """
+    # O relógio começa com a vaga no limitador: a espera na fila não
+    # entra na latência do link
+    start: float | None = None
+
+    async def request():
+        nonlocal start
+        start = time.perf_counter()
+        response = await client.head(link)
+        if response.status_code in HEAD_NOT_SUPPORTED:
+            # stream: lê só o status e os cabeçalhos, não o corpo
+            async with client.stream("GET", link) as response:
+                pass
+        return response.status_code
+
+    try:
+        status = await limiter.run(httpx.URL(link).host, request)
+        error = None
+    except Exception as exc:
+        # Qualquer falha (rede, URL malformada, IDNA...) fica no link; não
+        # interrompe a varredura
+        status = None
+        error = type(exc).__name__
+        if str(exc):
+            error = f"{error}: {exc}"[:255]
+    latency = 0.0
+    if start is not None:
+        latency = round((time.perf_counter() - start) * 1000, 3)
+    return {
+        "link_status": status,
+        "link_latency_ms": latency,
+        "link_error": error,
+    }
+
+
+# updated_at fica como está: verificar o link não é editar o documento.
+# created_at no filtro restringe cada UPDATE a uma partição de documents.
+_record_results = (
+    update(Document.__table__)
+    .where(
+        Document.__table__.c.id == bindparam("doc_id"),
+        Document.__table__.c.created_at == bindparam("doc_created_at"),
+    )
+    .values(
+        link_status=bindparam("link_status"),
+        link_latency_ms=bindparam("link_latency_ms"),
+        link_error=bindparam("link_error"),
+        last_checked_at=bindparam("last_checked_at"),
+        updated_at=Document.__table__.c.updated_at,
+    )
+)
+
+
+class LinkCheckSweep:
+    # Varre todos os documentos em lotes ordenados por id (keyset), cada
+    # lote com a própria sessão e o próprio commit. Uma varredura por vez
+    # por processo; o estado fica em `status`, na memória do processo:
+    # com vários workers, cada um vê só a varredura que ele iniciou.
+
+    def __init__(self):
+        self.task: asyncio.Task | None = None
+        self.status = {
+            "running": False,
+            "started_at": None,
+            "finished_at": None,
+            "checked": 0,
+            "broken": 0,
+            "error": None,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def start(self, session_factory) -> asyncio.Task:
+        self.task = asyncio.create_task(self.run(session_factory))
+        return self.task
+
+    async def run(self, session_factory):
+        self.status.update(
+            running=True,
+            started_at=datetime.now(UTC).replace(tzinfo=None),
+            finished_at=None,
+            checked=0,
+            broken=0,
+            error=None,
+        )
+        concurrency = settings.LINK_CHECK_CONCURRENCY
+        limiter = HostLimiter(concurrency, settings.LINK_CHECK_PER_HOST)
+        try:
+            async with httpx.AsyncClient(
+                timeout=settings.LINK_CHECK_TIMEOUT_SECONDS,
+                follow_redirects=True,
+                event_hooks={"request": [_guard_request]},
+                limits=httpx.Limits(
+                    max_connections=concurrency,
+                    max_keepalive_connections=concurrency,
+                ),
+            ) as client:
+                last_id = 0
+                while True:
+                    # Sessões curtas: nenhuma conexão do pool fica presa
+                    # enquanto as requisições HTTP estão em andamento
+                    async with session_factory() as db:
+                        result = await db.execute(
+                            select(
+                                Document.id,
+                                Document.created_at,
+                                Document.link,
+                            )
+                            .where(Document.id > last_id)
+                            .order_by(Document.id)
+                            .limit(settings.LINK_CHECK_BATCH_SIZE)
+                        )
+                        batch = result.all()
+                    if not batch:
+                        break
+                    checks = await asyncio.gather(
+                        *(
+                            check_link(client, limiter, doc.link)
+                            for doc in batch
+                        )
+                    )
+                    checked_at = datetime.now(UTC).replace(tzinfo=None)
+                    async with session_factory() as db:
+                        await db.execute(
+                            _record_results,
+                            [
+                                {
+                                    "doc_id": doc.id,
+                                    "doc_created_at": doc.created_at,
+                                    "last_checked_at": checked_at,
+                                    **check,
+                                }
+                                for doc, check in zip(batch, checks)
+                            ],
+                        )
+                        await db.commit()
+                    last_id = batch[-1].id
+                    self.status["checked"] += len(batch)
+                    self.status["broken"] += sum(
+                        1 for check in checks if is_broken(check)
+                    )
+        except Exception as exc:
+            logger.exception("Link check sweep failed")
+            self.status["error"] = type(exc).__name__
+        finally:
+            self.status.update(
+                running=False,
+                finished_at=datetime.now(UTC).replace(tzinfo=None),
+            )
+
+
+def is_broken(check) -> bool:
+    return check["link_status"] is None or check["link_status"] >= 400
+
+
+async def list_link_results(
+    db: AsyncSession, limit: int, after_id: int = 0, broken_only: bool = False
+):
+    query = (
+        select(Document)
+        .where(Document.id > after_id, Document.last_checked_at.is_not(None))
+        .order_by(Document.id)
+    )
+    if broken_only:
+        query = query.where(
+            Document.link_status.is_(None) | (Document.link_status >= 400)
+        )
+    result = await db.execute(query.limit(limit + 1))
+    docs = list(result.scalars().all())
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = docs[-1].id
+    return {"items": docs, "next_cursor": next_cursor}
+
+
+link_check_sweep = LinkCheckSweep()
@@ -0,0 +1,103 @@
+import time
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from hermanitto_docs_api.core.config import settings
+from hermanitto_docs_api.models.document_type import DocumentType
+from hermanitto_docs_api.schemas.document_type_schema import DocumentTypeOut
+
+
+class DocumentTypeCache:
+    # Os tipos de documento mudam raramente e a tabela é pequena: uma
+    # consulta carrega tudo em mapas id -> tipo e nome -> tipo, válidos
+    # por `ttl` segundos ou até invalidate() (chamado por create_type).
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._by_id: dict[int, DocumentTypeOut] = {}
+        self._by_name: dict[str, DocumentTypeOut] = {}
+        self._loaded_at: float | None = None
+        self._generation = 0
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.ttl
+        )
+
+    async def _load(self, db: AsyncSession):
+        generation = self._generation
+        result = await db.execute(
+            select(DocumentType).order_by(DocumentType.id)
+        )
+        types = [DocumentTypeOut.model_validate(t) for t in result.scalars()]
+        # Se houve invalidação durante a consulta, o resultado pode estar
+        # desatualizado: devolve, mas não guarda.
+        if generation == self._generation:
+            self._by_id = {t.id: t for t in types}
+            self._by_name = {t.name: t for t in types}
+            self._loaded_at = time.monotonic()
+        return types
+
+    async def list(self, db: AsyncSession) -> list[DocumentTypeOut]:
+        if self._is_fresh():
+            self.hits += 1
+            return list(self._by_id.values())
+        self.misses += 1
+        return await self._load(db)
+
+    async def get_many(
+        self, db: AsyncSession, type_ids
+    ) -> dict[int, DocumentTypeOut]:
+        type_ids = set(type_ids)
+        if self._is_fresh() and type_ids <= self._by_id.keys():
+            self.hits += 1
+            return {type_id: self._by_id[type_id] for type_id in type_ids}
+        # Id desconhecido: recarrega, pois o tipo pode ter sido criado por
+        # outro worker depois da última carga.
+        self.misses += 1
+        types = {t.id: t for t in await self._load(db)}
+        return {
+            type_id: types[type_id] for type_id in type_ids if type_id in types
+        }
+
+    async def get_by_id(
+        self, db: AsyncSession, type_id: int
+    ) -> DocumentTypeOut | None:
+        return (await self.get_many(db, [type_id])).get(type_id)
+
+    async def get_by_name(
+        self, db: AsyncSession, name: str
+    ) -> DocumentTypeOut | None:
+        if self._is_fresh() and name in self._by_name:
+            self.hits += 1
+            return self._by_name[name]
+        self.misses += 1
+        types = await self._load(db)
+        return next((t for t in types if t.name == name), None)
+
+    async def version(self, db: AsyncSession) -> str:
+        # Não há edição nem remoção de tipos: quantidade e maior id mudam
+        # a cada criação. Reflete o que list() serviria agora.
+        if not self._is_fresh():
+            await self._load(db)
+        return f"{len(self._by_id)}-{max(self._by_id, default=0)}"
+
+    def invalidate(self):
+        self._generation += 1
+        self._loaded_at = None
+        self._by_id = {}
+        self._by_name = {}
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._by_id),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+type_cache = DocumentTypeCache(settings.TYPE_CACHE_TTL_SECONDS)
@@ -1,17 +1,27 @@
+from collections import Counter
+from hermanitto_docs_api.core.response_cache import response_cache
 from hermanitto_docs_api.models.document_type import DocumentType
+from hermanitto_docs_api.models.document_type_count import DocumentTypeCount
+from sqlalchemy import func, insert
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from hermanitto_docs_api.schemas.document_type_schema import DocumentTypeCreate
+from hermanitto_docs_api.services.type_cache import type_cache
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 
 
 async def create_type(db: AsyncSession, type_in: DocumentTypeCreate):
-    doc_type = DocumentType(name=type_in.name)
-    db.add(doc_type)
     try:
+        doc_type = await db.scalar(
+            insert(DocumentType)
+            .values(name=type_in.name)
+            .returning(DocumentType)
+        )
         await db.commit()
-        await db.refresh(doc_type)
+        type_cache.invalidate()
+        await response_cache.invalidate("types")
         return doc_type
     except IntegrityError:
         await db.rollback()
@@ -22,5 +32,53 @@ async def create_type(db: AsyncSession, type_in: DocumentTypeCreate):
 
 
 async def list_types(db: AsyncSession):
-    result = await db.execute(select(DocumentType))
-    return result.scalars().all()
+    return await type_cache.list(db)
+
+
+async def types_version(db: AsyncSession) -> str:
+    return await type_cache.version(db)
+
+
+async def add_document_counts(db: AsyncSession, counts: Counter):
+    # Aplica os deltas por tipo, sem commit: quem chama roda na mesma
+    # transação do INSERT (deltas positivos) ou DELETE (negativos)
+    deltas = {type_id: n for type_id, n in counts.items() if n}
+    if not deltas:
+        return
+    dialect = db.get_bind().dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    table = DocumentTypeCount.__table__
+    stmt = insert(table)
+    # Upsert atômico: concorrentes somam no mesmo registro sem corrida
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.type_id],
+        set_={
+            "document_count": table.c.document_count
+            + stmt.excluded.document_count
+        },
+    )
+    await db.execute(
+        stmt,
+        [
+            {"type_id": type_id, "document_count": n}
+            for type_id, n in sorted(deltas.items())
+        ],
+    )
+
+
+async def type_stats(db: AsyncSession):
+    # Lê só os contadores: O(número de tipos), sem tocar em documents
+    result = await db.execute(
+        select(
+            DocumentType.id,
+            DocumentType.name,
+            func.coalesce(DocumentTypeCount.document_count, 0).label(
+                "document_count"
+            ),
+        )
+        .outerjoin(
+            DocumentTypeCount, DocumentTypeCount.type_id == DocumentType.id
+        )
+        .order_by(DocumentType.id)
+    )
+    return result.all()
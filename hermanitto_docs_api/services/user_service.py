@@ -1,24 +1,30 @@
 from hermanitto_docs_api.models.user import User
+from hermanitto_docs_api.core.cache import LRUCache
+from hermanitto_docs_api.core.config import settings
 from hermanitto_docs_api.core.security import (
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_and_update_password_async,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert
 from sqlalchemy.future import select
-from hermanitto_docs_api.schemas.user_schema import UserCreate
+from hermanitto_docs_api.schemas.user_schema import UserCreate, UserOut
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 
+# username -> UserOut, para tokens emitidos sem as claims do perfil
+user_cache = LRUCache(settings.USER_CACHE_SIZE)
+
 
 async def create_user(db: AsyncSession, user_in: UserCreate):
-    user = User(
-        username=user_in.username,
-        hashed_password=get_password_hash(user_in.password),
-    )
-    db.add(user)
+    hashed_password = await get_password_hash_async(user_in.password)
     try:
+        user = await db.scalar(
+            insert(User)
+            .values(username=user_in.username, hashed_password=hashed_password)
+            .returning(User)
+        )
         await db.commit()
-        await db.refresh(user)
         return user
     except IntegrityError:
         await db.rollback()
@@ -31,11 +37,47 @@ async def create_user(db: AsyncSession, user_in: UserCreate):
 async def authenticate_user(db: AsyncSession, username: str, password: str):
     result = await db.execute(select(User).where(User.username == username))
     user = result.scalar_one_or_none()
-    if user and verify_password(password, user.hashed_password):
-        return user
-    return None
+    if not user:
+        return None
+    valid, new_hash = await verify_and_update_password_async(
+        password, user.hashed_password
+    )
+    if not valid:
+        return None
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+        await db.refresh(user)
+    return user
 
 
 async def get_user_by_username(db: AsyncSession, username: str):
     result = await db.execute(select(User).where(User.username == username))
     return result.scalar_one_or_none()
+
+
+async def get_user_profile(
+    db: AsyncSession, username: str, claims: dict, fresh: bool = False
+) -> UserOut | None:
+    # Perfil sem ir ao banco: claims do token (id, username e created_at
+    # não mudam), depois o cache. Sem consulta, não se verifica se o
+    # usuário ainda existe: removido ou renomeado fora da API, ele segue
+    # recebendo o perfil até o token expirar. fresh=True consulta o banco
+    # (404 se não existir) e renova o cache.
+    if not fresh:
+        if "uid" in claims and "created_at" in claims:
+            return UserOut(
+                id=claims["uid"],
+                username=username,
+                created_at=claims["created_at"],
+            )
+        cached = user_cache.get(username)
+        if cached is not None:
+            return cached
+    user = await get_user_by_username(db, username)
+    if user is None:
+        user_cache.pop(username)
+        return None
+    profile = UserOut.model_validate(user)
+    user_cache.set(username, profile, ttl=settings.USER_CACHE_TTL_SECONDS)
+    return profile
@@ -12,6 +12,15 @@ setup(
         "python-jose[cryptography]",
         "passlib[bcrypt]",
         "python-multipart",
-        "uvicorn",
+        "uvicorn[standard]",
+        "httpx",
     ],
+    extras_require={"fast": ["orjson"], "redis": ["redis"]},
+    entry_points={
+        "console_scripts": [
+            "hermanitto-docs-api=hermanitto_docs_api.server:main",
+            "hermanitto-docs-maintenance="
+            "hermanitto_docs_api.maintenance:main",
+        ],
+    },
 )
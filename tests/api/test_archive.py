@@ -0,0 +1,247 @@
+import json
+import os
+from collections import Counter
+from datetime import datetime
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from hermanitto_docs_api import maintenance
+from hermanitto_docs_api.core.config import settings
+from hermanitto_docs_api.core.dependencies import get_session_factory
+from hermanitto_docs_api.core.security import create_access_token
+from hermanitto_docs_api.main import app
+from hermanitto_docs_api.models.base import Base
+from hermanitto_docs_api.models.document import Document, documents_archive
+from hermanitto_docs_api.models.document_type import DocumentType
+from hermanitto_docs_api.models.document_type_count import DocumentTypeCount
+from hermanitto_docs_api.services.archive_service import (
+    archive_documents,
+    ensure_partitions,
+    monthly_partitions,
+    retention_cutoff,
+)
+from hermanitto_docs_api.services.type_service import add_document_counts
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+OLD = datetime(2020, 1, 10)
+RECENT = datetime(2026, 10, 1)
+
+
+@pytest.fixture
+def headers():
+    token = create_access_token({"sub": "testuser"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def add_documents(db_session) -> dict[str, int]:
+    # Três documentos antigos e dois recentes, em dois tipos
+    types = [DocumentType(name="contrato"), DocumentType(name="recibo")]
+    db_session.add_all(types)
+    await db_session.flush()
+    contrato, recibo = (t.id for t in types)
+    docs = [
+        (contrato, "https://example.com/old-1.pdf", OLD),
+        (contrato, "https://example.com/old-2.pdf", OLD.replace(day=11)),
+        (recibo, "https://example.com/old-3.pdf", OLD.replace(day=12)),
+        (contrato, "https://example.com/new-1.pdf", RECENT),
+        (recibo, "https://example.com/new-2.pdf", RECENT.replace(day=2)),
+    ]
+    db_session.add_all(
+        Document(type_id=type_id, link=link, created_at=at, updated_at=at)
+        for type_id, link, at in docs
+    )
+    await add_document_counts(db_session, Counter({contrato: 3, recibo: 2}))
+    await db_session.commit()
+    return {"contrato": contrato, "recibo": recibo}
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_old_documents(
+    async_client: AsyncClient, db_session, headers, monkeypatch
+):
+    monkeypatch.setattr(settings, "DOCUMENTS_ARCHIVE_BATCH_SIZE", 2)
+    types = await add_documents(db_session)
+    url = "/api/v1/documents/"
+    before = await async_client.get(url, headers=headers)
+    assert len(before.json()["items"]) == 5
+
+    # SQLite não particiona: as linhas vão em lotes
+    summary = await archive_documents(db_session, datetime(2021, 1, 1))
+    assert summary == {"archived": 3, "partitions": [], "batches": 2}
+    assert await archive_documents(db_session, datetime(2021, 1, 1)) == {
+        "archived": 0,
+        "partitions": [],
+        "batches": 0,
+    }
+
+    response = await async_client.get(url, headers=headers)
+    assert [doc["link"][-9:] for doc in response.json()["items"]] == [
+        "new-1.pdf",
+        "new-2.pdf",
+    ]
+    assert response.headers["etag"] != before.headers["etag"]
+
+    # Contagens por tipo só com os documentos ativos
+    counts = dict(
+        (await db_session.execute(select(DocumentTypeCount.__table__))).all()
+    )
+    assert counts == {types["contrato"]: 1, types["recibo"]: 1}
+
+    # A busca (FTS) não encontra mais os arquivados
+    response = await async_client.get(
+        "/api/v1/documents/search", params={"q": "old-"}, headers=headers
+    )
+    assert response.json() == []
+
+    # include_archived pagina pelas duas tabelas, na mesma ordem
+    links, cursor = [], None
+    while True:
+        params = {"include_archived": True, "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = (
+            await async_client.get(url, params=params, headers=headers)
+        ).json()
+        links += [doc["link"] for doc in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert links == [doc["link"] for doc in before.json()["items"]]
+
+    response = await async_client.get(
+        "/api/v1/documents/export",
+        params={"include_archived": True},
+        headers=headers,
+    )
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert [doc["id"] for doc in exported] == sorted(
+        doc["id"] for doc in before.json()["items"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_maintenance_commands(db_session, monkeypatch):
+    await add_documents(db_session)
+    sessions = app.dependency_overrides[get_session_factory]()
+
+    async def run(*argv):
+        return await maintenance.run(maintenance.parse_args(argv), sessions)
+
+    # Sem particionamento, não há partições a criar
+    assert await run("partitions") == {"created": []}
+    # Sem --before e sem retenção configurada, nada é arquivado
+    summary = await run("archive")
+    assert summary["archived"] == 0
+    monkeypatch.setattr(settings, "DOCUMENTS_RETENTION_MONTHS", 12)
+    summary = await run("archive")
+    assert summary["archived"] == 3
+    summary = await run("archive", "--before", "2030-01-01")
+    assert summary["archived"] == 2
+    archived = await db_session.scalar(
+        select(text("count(*)")).select_from(documents_archive)
+    )
+    assert archived == 5
+
+
+def test_monthly_partitions_and_retention(monkeypatch):
+    months = list(
+        monthly_partitions(datetime(2025, 11, 20), datetime(2026, 1, 1))
+    )
+    assert months == [
+        ("documents_p202511", datetime(2025, 11, 1), datetime(2025, 12, 1)),
+        ("documents_p202512", datetime(2025, 12, 1), datetime(2026, 1, 1)),
+        ("documents_p202601", datetime(2026, 1, 1), datetime(2026, 2, 1)),
+    ]
+    assert retention_cutoff(datetime(2026, 3, 15)) is None
+    monkeypatch.setattr(settings, "DOCUMENTS_RETENTION_MONTHS", 3)
+    assert retention_cutoff(datetime(2026, 3, 15)) == datetime(2025, 12, 1)
+
+
+# Mesma forma que a migração 4f8a2d6c9e15 dá a documents
+PARTITIONED_DOCUMENTS = """
+CREATE TABLE documents (
+    id SERIAL,
+    type_id INTEGER NOT NULL REFERENCES document_types (id),
+    link VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    link_status INTEGER,
+    link_latency_ms FLOAT,
+    link_error VARCHAR(255),
+    last_checked_at TIMESTAMP,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at)
+"""
+
+
+@pytest.mark.skipif(not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL not set")
+@pytest.mark.asyncio
+async def test_archive_detaches_partitions_postgres():
+    # Schema temporário numa transação desfeita no fim; os commits do
+    # serviço viram savepoints
+    engine = create_async_engine(TEST_POSTGRES_URL)
+    try:
+        async with engine.connect() as conn:
+            trans = await conn.begin()
+            await conn.execute(text("CREATE SCHEMA archive_test"))
+            await conn.execute(text("SET LOCAL search_path TO archive_test"))
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(text("DROP TABLE documents"))
+            await conn.execute(text(PARTITIONED_DOCUMENTS))
+            await conn.execute(
+                text(
+                    "CREATE TABLE documents_default "
+                    "PARTITION OF documents DEFAULT"
+                )
+            )
+            async with AsyncSession(
+                bind=conn,
+                join_transaction_mode="create_savepoint",
+                expire_on_commit=False,
+            ) as db:
+                now = datetime(2026, 1, 15)
+                assert await ensure_partitions(db, 1, now) == [
+                    "documents_p202601",
+                    "documents_p202602",
+                ]
+                assert await ensure_partitions(db, 1, now) == []
+                await db.execute(
+                    insert(DocumentType.__table__).values(id=1, name="nf")
+                )
+                await db.execute(
+                    insert(Document.__table__),
+                    [
+                        {"type_id": 1, "link": "a", "created_at": at}
+                        for at in (
+                            datetime(2025, 6, 1),
+                            datetime(2026, 1, 10),
+                            datetime(2026, 1, 20),
+                            datetime(2026, 2, 10),
+                        )
+                    ],
+                )
+                await add_document_counts(db, Counter({1: 4}))
+                await db.commit()
+
+                summary = await archive_documents(db, datetime(2026, 2, 1))
+                assert summary == {
+                    "archived": 3,
+                    "partitions": ["documents_p202601"],
+                    "batches": 1,
+                }
+                parent = await db.scalar(
+                    text(
+                        "SELECT inhparent::regclass::text FROM pg_inherits "
+                        "WHERE inhrelid = 'documents_p202601'::regclass"
+                    )
+                )
+                assert parent == "documents_archive"
+                assert (
+                    await db.scalar(select(DocumentTypeCount.document_count))
+                    == 1
+                )
+            await trans.rollback()
+    finally:
+        await engine.dispose()
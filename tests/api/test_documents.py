@@ -1,11 +1,34 @@
+import csv
+import io
+import json
+import os
+from collections import Counter
+from datetime import datetime, timedelta
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine
+from hermanitto_docs_api.core.config import settings
+from hermanitto_docs_api.models.base import Base
+from hermanitto_docs_api.models.document import Document
 from hermanitto_docs_api.models.document_type import DocumentType
+from hermanitto_docs_api.models.document_type_count import DocumentTypeCount
 from hermanitto_docs_api.models.user import User
 from hermanitto_docs_api.core.security import (
     get_password_hash,
     create_access_token,
 )
+from hermanitto_docs_api.schemas.document_schema import (
+    DocumentCreate,
+    DocumentFilters,
+)
+from hermanitto_docs_api.services import document_service
+from hermanitto_docs_api.services.document_service import filter_documents
+from hermanitto_docs_api.services.type_service import add_document_counts
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
 
 
 @pytest.mark.asyncio
@@ -72,12 +95,419 @@ async def test_get_documents(async_client: AsyncClient, db_session):
     # List documents
     response = await async_client.get("/api/v1/documents/", headers=headers)
     assert response.status_code == 200
-    data = response.json()
+    data = response.json()["items"]
     assert len(data) == 2
     assert data[0]["link"] == doc_data[0]["link"]
     assert data[1]["link"] == doc_data[1]["link"]
 
 
+@pytest.mark.asyncio
+async def test_get_documents_paginated(async_client: AsyncClient, db_session):
+    user = User(
+        username="testuser", hashed_password=get_password_hash("testpass")
+    )
+    db_session.add(user)
+
+    doc_type = DocumentType(name="comprovante")
+    db_session.add(doc_type)
+    await db_session.commit()
+
+    token = create_access_token({"sub": user.username})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    links = [f"https://drive.google.com/file{i}.pdf" for i in range(5)]
+    for link in links:
+        await async_client.post(
+            "/api/v1/documents/",
+            json={"type_id": doc_type.id, "link": link},
+            headers=headers,
+        )
+
+    # Percorre todas as páginas seguindo o next_cursor
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = await async_client.get(
+            "/api/v1/documents/", params=params, headers=headers
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        seen.extend(doc["link"] for doc in page["items"])
+        if page["next_cursor"] is None:
+            break
+        params = {"limit": 2, "cursor": page["next_cursor"]}
+
+    assert seen == links
+
+
+@pytest.mark.asyncio
+async def test_get_documents_invalid_cursor(
+    async_client: AsyncClient, db_session
+):
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await async_client.get(
+        "/api/v1/documents/",
+        params={"cursor": "not-a-cursor"},
+        headers=headers,
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.asyncio
+async def test_get_documents_conditional(
+    async_client: AsyncClient, db_session
+):
+    doc_type = DocumentType(name="comprovante")
+    db_session.add(doc_type)
+    await db_session.commit()
+
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+    doc = {"type_id": doc_type.id, "link": "https://drive.google.com/a.pdf"}
+    await async_client.post("/api/v1/documents/", json=doc, headers=headers)
+
+    response = await async_client.get("/api/v1/documents/", headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    # Nada mudou: 304 sem corpo, só a consulta de versão
+    response = await async_client.get(
+        "/api/v1/documents/", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert response.headers["server-timing"].startswith('db;desc="1 queries";')
+
+    # Outra visão (query string) tem outro ETag
+    response = await async_client.get(
+        "/api/v1/documents/",
+        params={"limit": 1},
+        headers={**headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+    # Um novo documento muda a versão da coleção
+    await async_client.post("/api/v1/documents/", json=doc, headers=headers)
+    response = await async_client.get(
+        "/api/v1/documents/", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_documents_version_sees_out_of_order_commit(
+    async_client: AsyncClient, db_session
+):
+    doc_type = DocumentType(name="comprovante")
+    db_session.add(doc_type)
+    await db_session.flush()
+    now = datetime(2026, 10, 1)
+    db_session.add_all(
+        Document(
+            id=doc_id,
+            type_id=doc_type.id,
+            link=link,
+            created_at=at,
+            updated_at=at,
+        )
+        for doc_id, link, at in (
+            (1, "https://a/old.pdf", datetime(2020, 1, 1)),
+            (11, "https://a/b.pdf", now),
+        )
+    )
+    await add_document_counts(db_session, Counter({doc_type.id: 2}))
+    await db_session.commit()
+    headers = {
+        "Authorization": f"Bearer {create_access_token({'sub': 'testuser'})}"
+    }
+    etag = (
+        await async_client.get("/api/v1/documents/", headers=headers)
+    ).headers["etag"]
+
+    # Transação concorrente que pegou id menor e timestamps mais antigos,
+    # mas fez commit depois: max(id), max(updated_at) e min(created_at)
+    # não mudam
+    earlier = now - timedelta(seconds=1)
+    db_session.add(
+        Document(
+            id=10,
+            type_id=doc_type.id,
+            link="https://a/a.pdf",
+            created_at=earlier,
+            updated_at=earlier,
+        )
+    )
+    await add_document_counts(db_session, Counter([doc_type.id]))
+    await db_session.commit()
+    response = await async_client.get(
+        "/api/v1/documents/", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(response.json()["items"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_documents_fast_json(
+    async_client: AsyncClient, db_session, monkeypatch
+):
+    doc_type = DocumentType(name="comprovante")
+    db_session.add(doc_type)
+    await db_session.flush()
+    db_session.add_all(
+        Document(
+            type_id=doc_type.id, link=f"https://drive.google.com/f{i}.pdf"
+        )
+        for i in range(3)
+    )
+    await db_session.commit()
+
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+    requests = [
+        ("/api/v1/documents/", {"limit": 2}),
+        ("/api/v1/documents/search", {"q": "drive"}),
+    ]
+
+    async def fetch_all():
+        return [
+            await async_client.get(url, params=params, headers=headers)
+            for url, params in requests
+        ]
+
+    expected = await fetch_all()
+    monkeypatch.setattr(settings, "FAST_JSON", True)
+    for slow, fast in zip(expected, await fetch_all()):
+        assert fast.status_code == 200
+        assert fast.headers["content-type"] == "application/json"
+        assert fast.json() == slow.json()
+        assert fast.headers.get("etag") == slow.headers.get("etag")
+
+
+@pytest.mark.asyncio
+async def test_large_responses_are_gzipped(
+    async_client: AsyncClient, db_session
+):
+    doc_type = DocumentType(name="comprovante")
+    db_session.add(doc_type)
+    await db_session.flush()
+    db_session.add_all(
+        Document(
+            type_id=doc_type.id, link=f"https://drive.google.com/f{i}.pdf"
+        )
+        for i in range(50)
+    )
+    await db_session.commit()
+
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip"}
+
+    response = await async_client.get("/api/v1/documents/", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()["items"]) == 50
+
+    # Abaixo de GZIP_MINIMUM_SIZE a resposta segue sem compressão
+    response = await async_client.get(
+        "/api/v1/documents/", params={"limit": 1}, headers=headers
+    )
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+
+
+def filtered_query(filters: DocumentFilters):
+    query = select(Document).order_by(Document.created_at, Document.id)
+    return filter_documents(query, filters).limit(51)
+
+
+@pytest.mark.asyncio
+async def test_get_documents_filtered(async_client: AsyncClient, db_session):
+    invoice = DocumentType(name="nota")
+    receipt = DocumentType(name="recibo")
+    other = DocumentType(name="outro")
+    db_session.add_all([invoice, receipt, other])
+    await db_session.flush()
+
+    start = datetime(2026, 1, 1)
+    for i, doc_type in enumerate([invoice, receipt, other] * 2):
+        db_session.add(
+            Document(
+                type_id=doc_type.id,
+                link=f"https://drive.google.com/file{i}.pdf",
+                created_at=start + timedelta(days=i),
+                updated_at=start + timedelta(days=10 + i),
+            )
+        )
+    await db_session.commit()
+
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async def links(params):
+        response = await async_client.get(
+            "/api/v1/documents/", params=params, headers=headers
+        )
+        assert response.status_code == 200
+        return [doc["link"][-9:] for doc in response.json()["items"]]
+
+    assert await links({"type_id": [invoice.id, receipt.id]}) == [
+        "file0.pdf",
+        "file1.pdf",
+        "file3.pdf",
+        "file4.pdf",
+    ]
+    # created_from inclusivo, created_to exclusivo; fuso convertido p/ UTC
+    assert await links(
+        {
+            "created_from": "2026-01-02T00:00:00",
+            "created_to": "2026-01-04T03:00:00+03:00",
+        }
+    ) == ["file1.pdf", "file2.pdf"]
+    assert await links(
+        {"type_id": other.id, "updated_from": "2026-01-14T00:00:00"}
+    ) == ["file5.pdf"]
+
+
+@pytest.mark.asyncio
+async def test_filtered_query_plan_uses_indexes(db_session):
+    # SQLite: EXPLAIN QUERY PLAN precisa citar o índice composto, sem
+    # varredura da tabela inteira.
+    cases = {
+        "ix_documents_type_id_created_at_id": DocumentFilters(type_ids=[1]),
+        "ix_documents_created_at_id": DocumentFilters(
+            created_from=datetime(2026, 1, 1),
+            created_to=datetime(2026, 2, 1),
+        ),
+        "ix_documents_updated_at_id": DocumentFilters(
+            updated_from=datetime(2026, 1, 1),
+            updated_to=datetime(2026, 2, 1),
+        ),
+    }
+    conn = await db_session.connection()
+    for index, filters in cases.items():
+        compiled = filtered_query(filters).compile(
+            dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+        )
+        rows = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}")
+        plan = " ".join(row[-1] for row in rows)
+        assert f"USING INDEX {index}" in plan, plan
+        assert "SCAN documents " not in f"{plan} ", plan
+
+
+@pytest.mark.skipif(not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL not set")
+@pytest.mark.asyncio
+async def test_filtered_query_plan_uses_indexes_postgres():
+    # Cria as tabelas num schema temporário, dentro de uma transação
+    # desfeita no fim. Sem seqscan o planejador mostra se há índice que
+    # atenda ao filtro (com a tabela vazia ele preferiria varrer).
+    cases = {
+        "ix_documents_type_id_created_at_id": filtered_query(
+            DocumentFilters(type_ids=[1, 2])
+        ),
+        "ix_documents_created_at_id": filtered_query(
+            DocumentFilters(
+                created_from=datetime(2026, 1, 1),
+                created_to=datetime(2026, 2, 1),
+            )
+        ),
+        "ix_documents_updated_at_id": filtered_query(
+            DocumentFilters(
+                updated_from=datetime(2026, 1, 1),
+                updated_to=datetime(2026, 2, 1),
+            )
+        ),
+        # Mesma forma de consulta de search_documents
+        "ix_documents_link_trgm": select(Document)
+        .where(Document.link.ilike("%relatorio%"))
+        .limit(20),
+    }
+    engine = create_async_engine(TEST_POSTGRES_URL)
+    try:
+        async with engine.connect() as conn:
+            trans = await conn.begin()
+            await conn.execute(text("CREATE SCHEMA filter_plan_test"))
+            await conn.execute(
+                text("SET LOCAL search_path TO filter_plan_test")
+            )
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(text("SET LOCAL enable_seqscan TO off"))
+            for index, query in cases.items():
+                compiled = query.compile(
+                    dialect=postgresql.dialect(),
+                    compile_kwargs={"literal_binds": True},
+                )
+                rows = await conn.exec_driver_sql(f"EXPLAIN {compiled}")
+                plan = "\n".join(row[0] for row in rows)
+                assert index in plan, plan
+                assert "Seq Scan on documents" not in plan, plan
+            await trans.rollback()
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_search_documents(async_client: AsyncClient, db_session):
+    doc_type = DocumentType(name="comprovante")
+    db_session.add(doc_type)
+    await db_session.flush()
+    docs = [
+        Document(type_id=doc_type.id, link=link)
+        for link in [
+            "https://drive.google.com/Relatorio-2026.pdf",
+            "https://drive.google.com/relatorio-anual-consolidado-2025.pdf",
+            "https://drive.google.com/nota_fiscal.pdf",
+        ]
+    ]
+    db_session.add_all(docs)
+    await db_session.commit()
+
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async def search(q, **params):
+        response = await async_client.get(
+            "/api/v1/documents/search",
+            params={"q": q, **params},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        return [doc["id"] for doc in response.json()]
+
+    # Sem diferenciar maiúsculas; o link mais curto fica em primeiro
+    assert await search("RELATORIO") == [docs[0].id, docs[1].id]
+    assert await search("relatorio", limit=1) == [docs[0].id]
+    assert await search('"fiscal') == []
+    assert await search("nota_fiscal") == [docs[2].id]
+
+    # Os triggers mantêm o índice em dia com UPDATE e DELETE
+    docs[2].link = "https://drive.google.com/boleto.pdf"
+    await db_session.delete(docs[0])
+    await db_session.commit()
+    assert await search("nota_fiscal") == []
+    assert await search("boleto") == [docs[2].id]
+    assert await search("relatorio") == [docs[1].id]
+
+
+@pytest.mark.asyncio
+async def test_search_documents_query_too_short(
+    async_client: AsyncClient, db_session
+):
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await async_client.get(
+        "/api/v1/documents/search", params={"q": "ab"}, headers=headers
+    )
+    assert response.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_create_document_invalid_type(
     async_client: AsyncClient, db_session
@@ -105,8 +535,334 @@ async def test_create_document_invalid_type(
     assert response.json()["detail"] == "Document type not found"
 
 
+@pytest.mark.asyncio
+async def test_create_document_other_integrity_errors_propagate(db_session):
+    # Só a chave estrangeira do tipo vira 404; outra restrição sobe
+    doc_type = DocumentType(name="contrato")
+    db_session.add(doc_type)
+    await db_session.execute(
+        text(
+            "CREATE TRIGGER reject_documents BEFORE INSERT ON documents "
+            "BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+        )
+    )
+    await db_session.commit()
+    doc_in = DocumentCreate(
+        type_id=doc_type.id, link="https://example.com/a.pdf"
+    )
+    with pytest.raises(IntegrityError, match="rejected"):
+        await document_service.create_document(db_session, doc_in)
+
+
+@pytest.mark.asyncio
+async def test_create_document_statement_budget(
+    async_client: AsyncClient, db_session, statements
+):
+    doc_type = DocumentType(name="contrato")
+    db_session.add(doc_type)
+    await db_session.commit()
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await async_client.post(
+        "/api/v1/documents/",
+        json={"type_id": doc_type.id, "link": "https://example.com/a.pdf"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["created_at"]
+    # INSERT ... RETURNING + contador do tipo; sem consulta ao tipo nem
+    # SELECT de refresh
+    assert statements(response) == 2
+
+    # Tipo inexistente: a chave estrangeira barra o INSERT
+    response = await async_client.post(
+        "/api/v1/documents/",
+        json={"type_id": 9999, "link": "https://example.com/b.pdf"},
+        headers=headers,
+    )
+    assert response.status_code == 404
+    counts = (await db_session.scalars(select(DocumentTypeCount))).all()
+    assert [(c.type_id, c.document_count) for c in counts] == [
+        (doc_type.id, 1)
+    ]
+
+
 @pytest.mark.asyncio
 async def test_get_documents_unauthorized(async_client: AsyncClient):
     response = await async_client.get("/api/v1/documents/")
     assert response.status_code == 401
     assert response.json()["detail"] == "Not authenticated"
+
+
+@pytest.mark.asyncio
+async def test_export_documents_ndjson(
+    async_client: AsyncClient, db_session, monkeypatch
+):
+    # Força vários blocos do cursor do servidor
+    monkeypatch.setattr(settings, "DOCUMENTS_EXPORT_CHUNK_SIZE", 2)
+
+    user = User(
+        username="testuser", hashed_password=get_password_hash("testpass")
+    )
+    db_session.add(user)
+
+    doc_type = DocumentType(name="comprovante")
+    db_session.add(doc_type)
+    await db_session.commit()
+
+    token = create_access_token({"sub": user.username})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    links = [f"https://drive.google.com/file{i}.pdf" for i in range(3)]
+    for link in links:
+        await async_client.post(
+            "/api/v1/documents/",
+            json={"type_id": doc_type.id, "link": link},
+            headers=headers,
+        )
+
+    response = await async_client.get(
+        "/api/v1/documents/export", headers=headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["link"] for row in rows] == links
+    assert all(row["type_id"] == doc_type.id for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_export_documents_csv(async_client: AsyncClient, db_session):
+    user = User(
+        username="testuser", hashed_password=get_password_hash("testpass")
+    )
+    db_session.add(user)
+
+    doc_type = DocumentType(name="comprovante")
+    db_session.add(doc_type)
+    await db_session.commit()
+
+    token = create_access_token({"sub": user.username})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    await async_client.post(
+        "/api/v1/documents/",
+        json={"type_id": doc_type.id, "link": "https://drive.google.com/a,b"},
+        headers=headers,
+    )
+
+    response = await async_client.get(
+        "/api/v1/documents/export", params={"format": "csv"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["link"] == "https://drive.google.com/a,b"
+    assert rows[0]["type_id"] == str(doc_type.id)
+
+
+@pytest.mark.asyncio
+async def test_create_documents_bulk(async_client: AsyncClient, db_session):
+    user = User(
+        username="testuser", hashed_password=get_password_hash("testpass")
+    )
+    db_session.add(user)
+
+    boleto = DocumentType(name="boleto")
+    comprovante = DocumentType(name="comprovante")
+    db_session.add_all([boleto, comprovante])
+    await db_session.commit()
+
+    token = create_access_token({"sub": user.username})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    docs = [
+        {"type_id": boleto.id, "link": "https://drive.google.com/1.pdf"},
+        {"type_id": 9999, "link": "https://drive.google.com/2.pdf"},
+        {"type_id": comprovante.id, "link": "https://drive.google.com/3.pdf"},
+        {
+            "type_id": boleto.id,
+            "link": "https://drive.google.com/" + "x" * 300,
+        },
+    ]
+    response = await async_client.post(
+        "/api/v1/documents/bulk", json=docs, headers=headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [doc["link"] for doc in data["created"]] == [
+        docs[0]["link"],
+        docs[2]["link"],
+    ]
+    assert all("id" in doc for doc in data["created"])
+    assert data["errors"] == [
+        {"index": 1, "detail": "Document type not found"},
+        {"index": 3, "detail": "Link too long"},
+    ]
+
+    response = await async_client.get("/api/v1/documents/", headers=headers)
+    assert len(response.json()["items"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_create_documents_bulk_too_many(
+    async_client: AsyncClient, db_session, monkeypatch
+):
+    monkeypatch.setattr(settings, "DOCUMENTS_BULK_MAX_ITEMS", 2)
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    docs = [{"type_id": 1, "link": f"https://x/{i}.pdf"} for i in range(3)]
+    response = await async_client.post(
+        "/api/v1/documents/bulk", json=docs, headers=headers
+    )
+    assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_import_documents_csv(
+    async_client: AsyncClient, db_session, monkeypatch
+):
+    # Lotes e leituras pequenos para cruzar os limites de bloco
+    monkeypatch.setattr(settings, "DOCUMENTS_IMPORT_BATCH_SIZE", 2)
+    monkeypatch.setattr(document_service, "IMPORT_READ_SIZE", 7)
+    doc_type = DocumentType(name="comprovante")
+    db_session.add(doc_type)
+    await db_session.commit()
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    content = "\r\n".join(
+        [
+            "type_id,link",
+            f"{doc_type.id},https://drive.google.com/ação.pdf",
+            f'{doc_type.id},"https://drive.google.com/a,b.pdf"',
+            "999,https://drive.google.com/x.pdf",
+            "not-a-row",
+            f"{doc_type.id},{'x' * 300}",
+            "",
+            f"{doc_type.id},https://drive.google.com/last.pdf",
+        ]
+    )
+    response = await async_client.post(
+        "/api/v1/documents/import",
+        files={"file": ("docs.csv", content.encode(), "text/csv")},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "total": 6,
+        "imported": 3,
+        "failed": 3,
+        "batches": 2,
+        "errors": [
+            {"line": 4, "detail": "Document type not found"},
+            {"line": 5, "detail": "Invalid row"},
+            {"line": 6, "detail": "Link too long"},
+        ],
+    }
+
+    response = await async_client.get("/api/v1/documents/", headers=headers)
+    assert [doc["link"] for doc in response.json()["items"]] == [
+        "https://drive.google.com/ação.pdf",
+        "https://drive.google.com/a,b.pdf",
+        "https://drive.google.com/last.pdf",
+    ]
+    response = await async_client.get("/api/v1/types/stats", headers=headers)
+    assert response.json()[0]["document_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_import_documents_jsonl(async_client: AsyncClient, db_session):
+    doc_type = DocumentType(name="comprovante")
+    db_session.add(doc_type)
+    await db_session.commit()
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    lines = [
+        json.dumps({"type_id": doc_type.id, "link": f"https://x/{i}.pdf"})
+        for i in range(3)
+    ]
+    lines.append('{"type_id": 1')
+    # Sem coerção: link nulo, numérico ou objeto e type_id fracionário ou
+    # booleano são linhas inválidas
+    lines += [
+        json.dumps({"type_id": doc_type.id, "link": None}),
+        json.dumps({"type_id": doc_type.id, "link": 42}),
+        json.dumps({"type_id": doc_type.id, "link": {"url": "x"}}),
+        json.dumps({"type_id": doc_type.id + 0.9, "link": "https://x/y"}),
+        json.dumps({"type_id": True, "link": "https://x/z"}),
+    ]
+    response = await async_client.post(
+        "/api/v1/documents/import",
+        params={"format": "jsonl"},
+        files={"file": ("upload", "\n".join(lines).encode())},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["imported"], result["failed"]) == (3, 6)
+    assert result["errors"] == [
+        {"line": line, "detail": "Invalid row"} for line in range(4, 10)
+    ]
+    response = await async_client.get("/api/v1/documents/", headers=headers)
+    assert {doc["link"] for doc in response.json()["items"]} == {
+        f"https://x/{i}.pdf" for i in range(3)
+    }
+
+    response = await async_client.post(
+        "/api/v1/documents/import",
+        files={"file": ("docs.xlsx", b"")},
+        headers=headers,
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unsupported file format"
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_overlong_line(
+    async_client: AsyncClient, db_session, monkeypatch
+):
+    # Sem quebra de linha, o upload não pode acumular em memória
+    monkeypatch.setattr(settings, "DOCUMENTS_IMPORT_MAX_LINE_LENGTH", 100)
+    monkeypatch.setattr(document_service, "IMPORT_READ_SIZE", 16)
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+    for content in ("1," + "x" * 200, "1,a\n" + "x" * 200 + "\n1,b"):
+        response = await async_client.post(
+            "/api/v1/documents/import",
+            files={"file": ("docs.csv", content.encode())},
+            headers=headers,
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"] == (
+            "Lines must be at most 100 characters"
+        )
+
+
+@pytest.mark.asyncio
+async def test_import_sees_type_created_after_cache_load(
+    async_client: AsyncClient, db_session
+):
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+    await async_client.get("/api/v1/types/", headers=headers)
+
+    # Criado por fora da API (outro worker): o cache não é invalidado
+    doc_type = DocumentType(name="recibo")
+    db_session.add(doc_type)
+    await db_session.commit()
+    content = f"{doc_type.id},https://x/a.pdf\n9999,https://x/b.pdf\n"
+    response = await async_client.post(
+        "/api/v1/documents/import",
+        files={"file": ("docs.csv", content.encode())},
+        headers=headers,
+    )
+    result = response.json()
+    assert (result["imported"], result["failed"]) == (1, 1)
+    assert result["errors"] == [
+        {"line": 2, "detail": "Document type not found"}
+    ]
@@ -0,0 +1,229 @@
+import asyncio
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import httpx
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.future import select
+from hermanitto_docs_api.core.config import settings
+from hermanitto_docs_api.models.document import Document
+from hermanitto_docs_api.models.document_type import DocumentType
+from hermanitto_docs_api.core.security import create_access_token
+from hermanitto_docs_api.services.link_checker import (
+    BlockedLinkError,
+    HostLimiter,
+    check_link,
+    ensure_public,
+)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # /ok responde 200, /missing 404 e /no-head só aceita GET
+    requests = 0
+
+    def _reply(self, with_body: bool):
+        StubHandler.requests += 1
+        if self.path == "/ok":
+            code = 200
+        elif self.path == "/no-head" and self.command == "GET":
+            code = 200
+        elif self.path == "/no-head":
+            code = 405
+        else:
+            code = 404
+        body = b"stub"
+        self.send_response(code)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if with_body:
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._reply(with_body=False)
+
+    def do_GET(self):
+        self._reply(with_body=True)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.asyncio
+async def test_link_check_sweep(
+    async_client: AsyncClient, db_session, stub_server, monkeypatch
+):
+    # O servidor de teste é local
+    monkeypatch.setattr(settings, "LINK_CHECK_ALLOW_PRIVATE", True)
+    doc_type = DocumentType(name="comprovante")
+    db_session.add(doc_type)
+    await db_session.flush()
+    links = [
+        f"{stub_server}/ok",
+        f"{stub_server}/missing",
+        f"{stub_server}/no-head",
+        f"http://127.0.0.1:{closed_port()}/down",
+        "not a url",
+    ]
+    db_session.add_all(Document(type_id=doc_type.id, link=li) for li in links)
+    await db_session.commit()
+    updated_at = {
+        doc.id: doc.updated_at
+        for doc in (await db_session.scalars(select(Document))).all()
+    }
+
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await async_client.post(
+        "/api/v1/documents/link-check",
+        params={"wait": True},
+        headers=headers,
+    )
+    assert response.status_code == 202
+    status = response.json()
+    assert (status["running"], status["checked"], status["broken"]) == (
+        False,
+        5,
+        3,
+    )
+
+    response = await async_client.get(
+        "/api/v1/documents/link-check/results", headers=headers
+    )
+    results = {item["link"]: item for item in response.json()["items"]}
+    assert results[f"{stub_server}/ok"]["link_status"] == 200
+    assert results[f"{stub_server}/missing"]["link_status"] == 404
+    assert results[f"{stub_server}/no-head"]["link_status"] == 200
+    down = results[links[3]]
+    assert down["link_status"] is None
+    assert down["link_error"].startswith("ConnectError")
+    assert results["not a url"]["link_status"] is None
+    assert all(item["last_checked_at"] for item in results.values())
+    assert all(item["link_latency_ms"] >= 0 for item in results.values())
+
+    response = await async_client.get(
+        "/api/v1/documents/link-check/results",
+        params={"broken_only": True, "limit": 2},
+        headers=headers,
+    )
+    page = response.json()
+    assert [item["link"] for item in page["items"]] == links[1:4:2]
+    response = await async_client.get(
+        "/api/v1/documents/link-check/results",
+        params={"broken_only": True, "cursor": page["next_cursor"]},
+        headers=headers,
+    )
+    assert [item["link"] for item in response.json()["items"]] == links[4:]
+
+    # Verificar não conta como edição do documento
+    db_session.expire_all()
+    docs = (await db_session.scalars(select(Document))).all()
+    assert {doc.id: doc.updated_at for doc in docs} == updated_at
+
+
+@pytest.mark.asyncio
+async def test_link_check_blocks_private_addresses(
+    async_client: AsyncClient, db_session, stub_server
+):
+    doc_type = DocumentType(name="comprovante")
+    db_session.add(doc_type)
+    await db_session.flush()
+    links = [
+        f"{stub_server}/ok",
+        "http://169.254.169.254/latest/meta-data/",
+        "http://[::1]/",
+    ]
+    db_session.add_all(Document(type_id=doc_type.id, link=li) for li in links)
+    await db_session.commit()
+    StubHandler.requests = 0
+
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+    await async_client.post(
+        "/api/v1/documents/link-check",
+        params={"wait": True},
+        headers=headers,
+    )
+    response = await async_client.get(
+        "/api/v1/documents/link-check/results", headers=headers
+    )
+    items = response.json()["items"]
+    assert [item["link_status"] for item in items] == [None] * 3
+    assert all(
+        item["link_error"].startswith("BlockedLinkError") for item in items
+    )
+    assert StubHandler.requests == 0
+
+
+@pytest.mark.asyncio
+async def test_ensure_public():
+    await ensure_public(httpx.URL("http://8.8.8.8/doc.pdf"))
+    for url in (
+        "ftp://8.8.8.8/doc.pdf",
+        "http://localhost/",
+        "http://10.0.0.5/",
+        "http://100.64.0.1/",
+        "http://[::ffff:127.0.0.1]/",
+        "http://[fe80::1]/",
+    ):
+        with pytest.raises(BlockedLinkError):
+            await ensure_public(httpx.URL(url))
+
+
+@pytest.mark.asyncio
+async def test_host_limiter_bounds_concurrency():
+    limiter = HostLimiter(concurrency=3, per_host=2)
+    active: dict[str, int] = {"a": 0, "b": 0}
+    peak = {"a": 0, "b": 0, "total": 0}
+
+    async def job(host):
+        async def request():
+            active[host] += 1
+            peak[host] = max(peak[host], active[host])
+            peak["total"] = max(peak["total"], sum(active.values()))
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+
+        await limiter.run(host, request)
+
+    await asyncio.gather(*(job(host) for host in "aaaaabbbbb"))
+    assert peak == {"a": 2, "b": 2, "total": 3}
+
+
+class SlowClient:
+    # HEAD leva 50 ms; links com "bad" falham com um erro fora do httpx
+    async def head(self, link):
+        if "bad" in link:
+            raise UnicodeError("label too long")
+        await asyncio.sleep(0.05)
+        return type("Response", (), {"status_code": 200})()
+
+
+@pytest.mark.asyncio
+async def test_check_link_times_request_not_queue():
+    limiter = HostLimiter(concurrency=1, per_host=1)
+    checks = await asyncio.gather(
+        *(check_link(SlowClient(), limiter, "http://a/x") for _ in range(3))
+    )
+    # Em fila, a terceira esperou ~100 ms, mas a latência é só a do HEAD
+    assert all(50 <= c["link_latency_ms"] < 100 for c in checks)
+
+    check = await check_link(SlowClient(), limiter, "http://a/bad")
+    assert check["link_status"] is None
+    assert check["link_error"] == "UnicodeError: label too long"
@@ -0,0 +1,198 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from hermanitto_docs_api.core.config import settings
+from hermanitto_docs_api.core.query_stats import (
+    QueryStats,
+    current_query_stats,
+)
+from hermanitto_docs_api.core.security import create_access_token
+from hermanitto_docs_api.models.document_type import DocumentType
+from hermanitto_docs_api.core.dependencies import (
+    InstrumentedPool,
+    engine_options,
+    get_session_factory,
+    pool_stats,
+)
+from hermanitto_docs_api.api import ops
+from hermanitto_docs_api import main
+from hermanitto_docs_api.core.readiness import Readiness, open_connections
+from hermanitto_docs_api.services.type_cache import type_cache
+
+
+def test_engine_options_postgres():
+    options = engine_options("postgresql+asyncpg://user:password@db/db")
+    assert options["poolclass"] is InstrumentedPool
+    assert options["echo"] is False
+    assert {"pool_size", "max_overflow", "pool_timeout"} <= options.keys()
+    assert "prepared_statement_cache_size" in options["connect_args"]
+
+
+def test_engine_options_sqlite():
+    assert engine_options("sqlite+aiosqlite:///:memory:") == {"echo": False}
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_tracks_checkouts(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedPool,
+        pool_size=2,
+    )
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        stats = pool_stats(engine.pool)
+        assert stats["checked_out"] == 1
+    stats = pool_stats(engine.pool)
+    await engine.dispose()
+
+    assert stats["pool"] == "InstrumentedPool"
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 1
+    assert stats["wait_seconds_total"] >= stats["wait_seconds_max"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_endpoint(async_client: AsyncClient):
+    response = await async_client.get("/pool-stats")
+    assert response.status_code == 200
+    assert "pool" in response.json()
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(async_client: AsyncClient):
+    await async_client.get("/api/v1/types/")
+
+    response = await async_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    labels = 'method="GET",route="/api/v1/types/",status="401"'
+    assert f"http_requests_total{{{labels}}}" in body
+    assert (
+        f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}}' in body
+    )
+    assert "http_requests_in_flight 1" in body
+    assert "type_cache_hits" in body
+    assert "db_pool_checked_out" in body
+    assert "login_rate_limit_rejected 0" in body
+    assert "db_read_replica_down 0" in body
+
+
+@pytest.mark.asyncio
+async def test_metrics_unmatched_route(async_client: AsyncClient):
+    await async_client.get("/does-not-exist/123")
+
+    body = (await async_client.get("/metrics")).text
+    assert 'route="<unmatched>",status="404"' in body
+    assert "/does-not-exist/123" not in body
+
+
+@pytest.mark.asyncio
+async def test_server_timing_reports_queries(
+    async_client: AsyncClient, db_session
+):
+    token = create_access_token({"sub": "testuser"})
+    response = await async_client.get(
+        "/api/v1/documents/", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    # Versão da coleção (ETag) + página
+    assert response.headers["server-timing"].startswith(
+        'db;desc="2 queries";dur='
+    )
+
+
+@pytest.mark.asyncio
+async def test_repeated_statement_warns(db_session, caplog, monkeypatch):
+    monkeypatch.setattr(settings, "SQL_REPEAT_WARN_THRESHOLD", 3)
+    stats = QueryStats("/test")
+    token = current_query_stats.set(stats)
+    try:
+        for type_id in range(5):
+            await db_session.execute(
+                select(DocumentType).where(DocumentType.id == type_id)
+            )
+    finally:
+        current_query_stats.reset(token)
+
+    assert stats.count == 5
+    assert stats.duration > 0
+    warnings = [r for r in caplog.records if "Possible N+1" in r.message]
+    assert len(warnings) == 1
+    assert "/test" in warnings[0].message
+
+
+@pytest.mark.asyncio
+async def test_failed_statement_leaves_no_timer(db_session):
+    conn = await db_session.connection()
+    for _ in range(3):
+        with pytest.raises(Exception):
+            await db_session.execute(text("SELECT * FROM missing_table"))
+    await db_session.execute(text("SELECT 1"))
+    assert "query_start" not in (await conn.get_raw_connection()).info
+
+
+@pytest.mark.asyncio
+async def test_open_connections_fills_pool(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}",
+        poolclass=InstrumentedPool,
+        pool_size=3,
+    )
+    await open_connections(engine, 5)
+    # Limitado ao tamanho do pool; todas devolvidas e prontas
+    assert engine.pool.checkedin() == 3
+    assert engine.pool.checkedout() == 0
+    await engine.dispose()
+
+
+@pytest.fixture
+def readiness(monkeypatch):
+    readiness = Readiness()
+    monkeypatch.setattr(ops, "readiness", readiness)
+    monkeypatch.setattr(main, "readiness", readiness)
+    return readiness
+
+
+@pytest.mark.asyncio
+async def test_readyz_after_warm_up(async_client: AsyncClient, readiness):
+    response = await async_client.get("/healthz")
+    assert response.json() == {"status": "ok"}
+    response = await async_client.get("/readyz")
+    assert response.status_code == 503
+
+    misses = type_cache.stats()["misses"]
+    sessions = main.app.dependency_overrides[get_session_factory]()
+    await main.warm_up_until_ready(sessions.kw["bind"], sessions)
+
+    response = await async_client.get("/readyz")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ready"
+    assert body["import_to_ready_seconds"] >= body["warmup_seconds"] > 0
+    assert type_cache.stats()["misses"] == misses + 1
+    metrics = (await async_client.get("/metrics")).text
+    assert "app_ready 1" in metrics
+
+
+@pytest.mark.asyncio
+async def test_warm_up_retries_until_database_answers(
+    async_client: AsyncClient, readiness, monkeypatch
+):
+    monkeypatch.setattr(settings, "WARMUP_RETRY_SECONDS", 0.01)
+    engine = create_async_engine("sqlite+aiosqlite:////nonexistent/dir/w.db")
+    sessions = main.app.dependency_overrides[get_session_factory]()
+    task = asyncio.create_task(main.warm_up_until_ready(engine, sessions))
+    while readiness.attempts < 2:
+        await asyncio.sleep(0.01)
+    task.cancel()
+
+    response = await async_client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json() == {
+        "status": "starting",
+        "error": "OperationalError",
+    }
@@ -0,0 +1,106 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.requests import Request
+from hermanitto_docs_api.main import app
+from hermanitto_docs_api.core import dependencies
+from hermanitto_docs_api.core.dependencies import (
+    ReadRouter,
+    get_read_db,
+    get_session_factory,
+)
+
+# A fábrica de sessões de teste (primário) que o conftest registra
+TestingSessionLocal = app.dependency_overrides[get_session_factory]()
+
+
+def make_request(host="10.0.0.1", headers=None) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [
+                (k.lower().encode(), v.encode())
+                for k, v in (headers or {}).items()
+            ],
+            "client": (host, 1234),
+        }
+    )
+
+
+@pytest.fixture
+def router(monkeypatch):
+    router = ReadRouter()
+    monkeypatch.setattr(dependencies, "read_router", router)
+    monkeypatch.setattr(dependencies, "SessionLocal", TestingSessionLocal)
+    return router
+
+
+@pytest.fixture
+async def replica(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    monkeypatch.setattr(
+        dependencies, "ReadSessionLocal", async_sessionmaker(engine)
+    )
+    yield engine
+    await engine.dispose()
+
+
+async def read_session(request):
+    gen = get_read_db(request)
+    session = await gen.__anext__()
+    await gen.aclose()
+    return session
+
+
+@pytest.mark.asyncio
+async def test_read_db_without_replica_uses_primary(router, monkeypatch):
+    monkeypatch.setattr(dependencies, "ReadSessionLocal", None)
+    session = await read_session(make_request())
+    assert session.bind is TestingSessionLocal.kw["bind"]
+    assert router.counts["primary_no_replica"] == 1
+
+
+@pytest.mark.asyncio
+async def test_read_db_routes_to_replica(router, replica):
+    session = await read_session(make_request())
+    assert session.bind is replica
+    assert router.counts["replica"] == 1
+
+    session = await read_session(
+        make_request(headers={"X-Consistency": "strong"})
+    )
+    assert session.bind is not replica
+    assert router.counts["primary_consistency"] == 1
+
+
+@pytest.mark.asyncio
+async def test_commit_opens_read_your_writes_window(router, replica):
+    async with TestingSessionLocal() as session:
+        session.info["client"] = "10.0.0.1"
+        await session.execute(text("SELECT 1"))
+        await session.commit()
+
+    assert (await read_session(make_request())).bind is not replica
+    assert router.counts["primary_recent_write"] == 1
+    # Outro cliente continua lendo da réplica
+    assert (await read_session(make_request("10.0.0.2"))).bind is replica
+
+
+@pytest.mark.asyncio
+async def test_unavailable_replica_falls_back_to_primary(router, monkeypatch):
+    # Diretório inexistente: a conexão com a "réplica" falha
+    engine = create_async_engine("sqlite+aiosqlite:////nonexistent/dir/r.db")
+    monkeypatch.setattr(
+        dependencies, "ReadSessionLocal", async_sessionmaker(engine)
+    )
+    session = await read_session(make_request())
+    assert session.bind is not engine
+    assert router.counts["primary_fallback"] == 1
+    assert router.stats()["replica_down"] == 1
+
+    # Durante a pausa nem tenta a réplica de novo
+    assert router.route(make_request()) == "primary_fallback"
+    router.replica_down_until = 0
+    assert router.route(make_request()) == "replica"
@@ -0,0 +1,194 @@
+import pytest
+from httpx import AsyncClient
+from hermanitto_docs_api.core import dependencies
+from hermanitto_docs_api.core.config import settings
+from hermanitto_docs_api.core.dependencies import (
+    ReadRouter,
+    get_read_db,
+    get_session_factory,
+)
+from hermanitto_docs_api.core.response_cache import (
+    MemoryResponseCacheBackend,
+    RedisResponseCacheBackend,
+    response_cache,
+)
+from hermanitto_docs_api.core.security import create_access_token
+from hermanitto_docs_api.main import app
+from hermanitto_docs_api.models.document_type import DocumentType
+
+
+class FakeRedis:
+    # Substituto local com o subconjunto de comandos que o backend usa
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        self.data[key] = value
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+
+
+class BrokenBackend(MemoryResponseCacheBackend):
+    async def tag_versions(self, tags):
+        raise ConnectionError("backend down")
+
+
+@pytest.fixture
+def headers():
+    token = create_access_token({"sub": "testuser"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(autouse=True)
+def enable_cache(monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_TTL_SECONDS", 30)
+
+
+async def add_type(db_session, name="contrato") -> int:
+    doc_type = DocumentType(name=name)
+    db_session.add(doc_type)
+    await db_session.commit()
+    return doc_type.id
+
+
+@pytest.mark.asyncio
+async def test_documents_list_cached_until_write(
+    async_client: AsyncClient, db_session, headers, statements
+):
+    type_id = await add_type(db_session)
+    url = "/api/v1/documents/"
+    first = await async_client.get(url, headers=headers)
+    second = await async_client.get(url, headers=headers)
+    assert statements(second) == 0
+    assert second.json() == first.json() == {"items": [], "next_cursor": None}
+    assert second.headers["etag"] == first.headers["etag"]
+
+    # Cliente com o ETag recebe 304 direto do cache
+    response = await async_client.get(
+        url, headers={**headers, "If-None-Match": first.headers["etag"]}
+    )
+    assert response.status_code == 304
+
+    # Outra query string é outra entrada
+    response = await async_client.get(
+        url, params={"limit": 1}, headers=headers
+    )
+    assert statements(response) != 0
+
+    await async_client.post(
+        url,
+        json={"type_id": type_id, "link": "https://example.com/a.pdf"},
+        headers=headers,
+    )
+    response = await async_client.get(url, headers=headers)
+    assert len(response.json()["items"]) == 1
+    assert response_cache.stats()["invalidations"] == 1
+    assert response_cache.stats()["hits"] == 2
+
+    metrics = (await async_client.get("/metrics")).text
+    assert "response_cache_hits 2" in metrics
+
+
+@pytest.mark.asyncio
+async def test_cache_control_no_cache_bypasses_lookup(
+    async_client: AsyncClient, db_session, headers, statements
+):
+    await async_client.get("/api/v1/types/stats", headers=headers)
+    response = await async_client.get(
+        "/api/v1/types/stats",
+        headers={**headers, "Cache-Control": "no-cache"},
+    )
+    assert statements(response) != 0
+    assert response_cache.stats()["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_backend_invalidates_by_tag(
+    async_client: AsyncClient, db_session, headers, monkeypatch, statements
+):
+    monkeypatch.setattr(
+        response_cache, "backend", RedisResponseCacheBackend(FakeRedis())
+    )
+    type_id = await add_type(db_session)
+    response = await async_client.get("/api/v1/types/stats", headers=headers)
+    assert response.json()[0]["document_count"] == 0
+    response = await async_client.get("/api/v1/types/stats", headers=headers)
+    assert statements(response) == 0
+
+    # Criar documento invalida a tag "documents", que as contagens usam
+    await async_client.post(
+        "/api/v1/documents/",
+        json={"type_id": type_id, "link": "https://example.com/a.pdf"},
+        headers=headers,
+    )
+    response = await async_client.get("/api/v1/types/stats", headers=headers)
+    assert response.json()[0]["document_count"] == 1
+
+    # Criar tipo invalida a lista de tipos
+    await async_client.get("/api/v1/types/", headers=headers)
+    await async_client.post("/api/v1/types/", json={"name": "recibo"})
+    response = await async_client.get("/api/v1/types/", headers=headers)
+    assert {t["name"] for t in response.json()} == {"contrato", "recibo"}
+
+
+@pytest.mark.asyncio
+async def test_replica_read_after_invalidation_is_not_stored(
+    async_client: AsyncClient, db_session, headers, monkeypatch, statements
+):
+    # get_read_db de verdade, com a "réplica" no mesmo banco de teste
+    sessions = app.dependency_overrides[get_session_factory]()
+    router = ReadRouter()
+    monkeypatch.setattr(dependencies, "read_router", router)
+    monkeypatch.setattr(dependencies, "SessionLocal", sessions)
+    monkeypatch.setattr(dependencies, "ReadSessionLocal", sessions)
+    monkeypatch.delitem(app.dependency_overrides, get_read_db)
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 60)
+    type_id = await add_type(db_session)
+    url = "/api/v1/documents/"
+    await async_client.post(
+        url,
+        json={"type_id": type_id, "link": "https://example.com/a.pdf"},
+        headers=headers,
+    )
+    # Outro cliente, sem a janela de read-your-writes: lê da réplica
+    router.recent_writers.clear()
+
+    await async_client.get(url, headers=headers)
+    response = await async_client.get(url, headers=headers)
+    assert statements(response) != 0
+    assert router.counts["replica"] == 2
+    assert response_cache.stats()["stores"] == 0
+
+    # Passada a janela, a réplica já alcançou o primário
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 0)
+    await async_client.get(url, headers=headers)
+    response = await async_client.get(url, headers=headers)
+    assert statements(response) == 0
+    assert len(response.json()["items"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_backend_failure_falls_back_to_endpoint(
+    async_client: AsyncClient, headers, monkeypatch
+):
+    monkeypatch.setattr(response_cache, "backend", BrokenBackend(10))
+    response = await async_client.get("/api/v1/types/", headers=headers)
+    assert response.status_code == 200
+    assert response_cache.stats()["backend_errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recent():
+    backend = MemoryResponseCacheBackend(max_entries=2)
+    for key in ("a", "b", "c"):
+        await backend.set(key, key.encode(), ttl=30)
+    assert await backend.get("a") is None
+    assert await backend.get("c") == b"c"
+    assert backend.stats() == {"size": 2, "evictions": 1}
@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from hermanitto_docs_api import main, server
+from hermanitto_docs_api.core.dependencies import InstrumentedPool
+
+
+def test_server_options_defaults(monkeypatch):
+    monkeypatch.setattr(server, "cpu_count", lambda: 4)
+    monkeypatch.setattr(server, "_available", lambda module: True)
+    options = server.server_options(server.parse_args([]))
+    assert options["workers"] == 4
+    assert (options["loop"], options["http"]) == ("uvloop", "httptools")
+    assert options["access_log"] is False
+    assert options["timeout_graceful_shutdown"] == 30
+    assert "reload" not in options
+
+
+def test_server_options_without_speedups(monkeypatch):
+    monkeypatch.setattr(server, "_available", lambda module: False)
+    args = server.parse_args(["--workers", "2", "--backlog", "512"])
+    options = server.server_options(args)
+    assert (options["loop"], options["http"]) == ("asyncio", "h11")
+    assert (options["workers"], options["backlog"]) == (2, 512)
+
+
+@pytest.mark.parametrize(
+    "workers, expected_app",
+    [(1, main.app), (3, server.APP)],
+)
+def test_main_preloads_app(monkeypatch, workers, expected_app):
+    # Vários workers precisam do caminho de importação, não do objeto
+    calls = []
+    monkeypatch.setattr(
+        server.uvicorn, "run", lambda app, **options: calls.append(app)
+    )
+    server.main(["--workers", str(workers)])
+    assert calls == [expected_app]
+
+
+@pytest.mark.asyncio
+async def test_lifespan_shutdown_disposes_pool(tmp_path, monkeypatch):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'life.db'}",
+        poolclass=InstrumentedPool,
+        pool_size=2,
+    )
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    assert engine.pool.checkedin() == 1
+    monkeypatch.setattr(main, "engine", engine)
+    monkeypatch.setattr(main, "read_engine", None)
+
+    async def no_warm_up(*args):
+        pass
+
+    monkeypatch.setattr(main, "warm_up_until_ready", no_warm_up)
+    async with main.lifespan(main.app):
+        pass
+    assert engine.pool.checkedin() == 0
@@ -1,6 +1,9 @@
 import pytest
 from httpx import AsyncClient
+from hermanitto_docs_api.core.config import settings
+from hermanitto_docs_api.models.document_type import DocumentType
 from hermanitto_docs_api.models.user import User
+from hermanitto_docs_api.services.type_cache import type_cache
 from hermanitto_docs_api.core.security import (
     get_password_hash,
     create_access_token,
@@ -91,3 +94,132 @@ async def test_list_types_unauthorized(async_client: AsyncClient):
     response = await async_client.get("/api/v1/types/")
     assert response.status_code == 401
     assert response.json()["detail"] == "Not authenticated"
+
+
+@pytest.mark.asyncio
+async def test_list_types_uses_cache(async_client: AsyncClient, db_session):
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    await async_client.post(
+        "/api/v1/types/", json={"name": "boleto"}, headers=headers
+    )
+    await async_client.get("/api/v1/types/", headers=headers)
+    hits = type_cache.hits
+    response = await async_client.get("/api/v1/types/", headers=headers)
+    assert type_cache.hits == hits + 1
+    assert [t["name"] for t in response.json()] == ["boleto"]
+
+    # Criar um tipo invalida o cache
+    await async_client.post(
+        "/api/v1/types/", json={"name": "holerite"}, headers=headers
+    )
+    response = await async_client.get("/api/v1/types/", headers=headers)
+    assert [t["name"] for t in response.json()] == ["boleto", "holerite"]
+
+
+@pytest.mark.asyncio
+async def test_type_cache_reloads_unknown_id(db_session):
+    assert await type_cache.get_by_id(db_session, 1) is None
+
+    # Tipo criado fora do processo (ex.: outro worker)
+    db_session.add(DocumentType(name="boleto"))
+    await db_session.commit()
+
+    doc_type = await type_cache.get_by_id(db_session, 1)
+    assert doc_type is not None
+    assert doc_type.name == "boleto"
+    assert await type_cache.get_by_name(db_session, "boleto") == doc_type
+
+
+@pytest.mark.asyncio
+async def test_list_types_conditional(async_client: AsyncClient, db_session):
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+    await async_client.post(
+        "/api/v1/types/", json={"name": "boleto"}, headers=headers
+    )
+
+    response = await async_client.get("/api/v1/types/", headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    # Com o cache de tipos quente o 304 não consulta o banco
+    response = await async_client.get(
+        "/api/v1/types/", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["server-timing"].startswith('db;desc="0 queries";')
+
+    await async_client.post(
+        "/api/v1/types/", json={"name": "recibo"}, headers=headers
+    )
+    response = await async_client.get(
+        "/api/v1/types/", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_list_types_fast_json(
+    async_client: AsyncClient, db_session, monkeypatch
+):
+    db_session.add_all([DocumentType(name="boleto"), DocumentType(name="rg")])
+    await db_session.commit()
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    expected = await async_client.get("/api/v1/types/", headers=headers)
+    monkeypatch.setattr(settings, "FAST_JSON", True)
+    response = await async_client.get("/api/v1/types/", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == expected.json()
+    assert response.headers["etag"] == expected.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_type_stats(async_client: AsyncClient, db_session):
+    types = [DocumentType(name=name) for name in ("boleto", "rg", "cpf")]
+    db_session.add_all(types)
+    await db_session.commit()
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    await async_client.post(
+        "/api/v1/documents/",
+        json={"type_id": types[0].id, "link": "https://drive.google.com/a"},
+        headers=headers,
+    )
+    await async_client.post(
+        "/api/v1/documents/bulk",
+        json=[
+            {"type_id": types[0].id, "link": "https://drive.google.com/b"},
+            {"type_id": types[1].id, "link": "https://drive.google.com/c"},
+            {"type_id": types[1].id, "link": "https://drive.google.com/d"},
+            {"type_id": 999, "link": "https://drive.google.com/e"},
+        ],
+        headers=headers,
+    )
+
+    response = await async_client.get("/api/v1/types/stats", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": types[0].id, "name": "boleto", "document_count": 2},
+        {"id": types[1].id, "name": "rg", "document_count": 2},
+        {"id": types[2].id, "name": "cpf", "document_count": 0},
+    ]
+    # Uma consulta nos contadores, sem COUNT sobre documents
+    assert response.headers["server-timing"].startswith('db;desc="1 queries";')
+
+
+@pytest.mark.asyncio
+async def test_create_type_is_a_single_statement(
+    async_client: AsyncClient, statements
+):
+    response = await async_client.post(
+        "/api/v1/types/", json={"name": "contrato"}
+    )
+    assert response.status_code == 200
+    assert response.json()["name"] == "contrato"
+    assert statements(response) == 1
@@ -1,8 +1,19 @@
 import pytest
 from fastapi.testclient import TestClient
-from hermanitto_docs_api.core.security import create_access_token
+from httpx import AsyncClient
+from hermanitto_docs_api.core.config import settings
+from hermanitto_docs_api.core.rate_limit import (
+    MemoryRateLimitBackend,
+    RateLimiter,
+    login_limiter,
+)
+from hermanitto_docs_api.core.security import (
+    create_access_token,
+    token_cache,
+)
 from hermanitto_docs_api.models.user import User
-from hermanitto_docs_api.core.security import get_password_hash
+from hermanitto_docs_api.services.user_service import user_cache
+from hermanitto_docs_api.core.security import get_password_hash, pwd_context
 
 
 @pytest.mark.asyncio
@@ -86,9 +97,196 @@ async def test_get_me(client: TestClient, db_session):
     assert data["username"] == "testuser"
 
 
+@pytest.mark.asyncio
+async def test_get_me_served_from_token_claims(
+    async_client: AsyncClient, db_session, statements
+):
+    user = User(
+        username="testuser", hashed_password=get_password_hash("testpass")
+    )
+    db_session.add(user)
+    await db_session.commit()
+    response = await async_client.post(
+        "/api/v1/users/login",
+        json={"username": "testuser", "password": "testpass"},
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await async_client.get("/api/v1/users/me", headers=headers)
+    assert statements(response) == 0
+    profile = response.json()
+    assert profile["id"] == user.id
+
+    # Cache-Control: no-cache força a leitura do banco, com o mesmo perfil
+    response = await async_client.get(
+        "/api/v1/users/me",
+        headers={**headers, "Cache-Control": "no-cache"},
+    )
+    assert statements(response) == 1
+    assert response.json() == profile
+
+    # Sem consulta não há verificação de existência: só no-cache vê a
+    # remoção do usuário
+    await db_session.delete(user)
+    await db_session.commit()
+    response = await async_client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 200
+    response = await async_client.get(
+        "/api/v1/users/me",
+        headers={**headers, "Cache-Control": "no-cache"},
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_me_caches_profile_for_tokens_without_claims(
+    async_client: AsyncClient, db_session, statements
+):
+    db_session.add(
+        User(username="testuser", hashed_password=get_password_hash("x"))
+    )
+    await db_session.commit()
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = await async_client.get("/api/v1/users/me", headers=headers)
+    assert statements(first) == 1
+    second = await async_client.get("/api/v1/users/me", headers=headers)
+    assert statements(second) == 0
+    assert second.json() == first.json()
+    assert len(user_cache) == 1
+
+
 def test_get_me_invalid_token(client: TestClient):
     response = client.get(
         "/api/v1/users/me", headers={"Authorization": "Bearer invalid-token"}
     )
     assert response.status_code == 401
     assert response.json()["detail"] == "Invalid token"
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_password(
+    client: TestClient, db_session
+):
+    # Hash gerado com custo diferente do configurado em BCRYPT_ROUNDS
+    user = User(
+        username="testuser",
+        hashed_password=pwd_context.handler().using(rounds=4).hash("testpass"),
+    )
+    db_session.add(user)
+    await db_session.commit()
+
+    response = client.post(
+        "/api/v1/users/login",
+        json={"username": "testuser", "password": "testpass"},
+    )
+    assert response.status_code == 200
+
+    await db_session.refresh(user)
+    assert not pwd_context.needs_update(user.hashed_password)
+    assert pwd_context.verify("testpass", user.hashed_password)
+
+
+def test_get_current_user_caches_verified_token(client: TestClient):
+    token = create_access_token({"sub": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    client.get("/api/v1/types/", headers=headers)
+    assert len(token_cache) == 1
+    hits = token_cache.hits
+
+    response = client.get("/api/v1/types/", headers=headers)
+    assert response.status_code == 200
+    assert token_cache.hits == hits + 1
+
+
+def test_expired_token_is_rejected_and_not_cached(client: TestClient):
+    token = create_access_token({"sub": "testuser"}, expires_delta=-1)
+
+    response = client.get(
+        "/api/v1/users/me", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 401
+    assert len(token_cache) == 0
+
+
+def test_login_throttled_per_username(client: TestClient, monkeypatch):
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_PER_USER", 3)
+    credentials = {"username": "victim", "password": "wrong"}
+    for _ in range(3):
+        response = client.post("/api/v1/users/login", json=credentials)
+        assert response.status_code == 401
+
+    response = client.post("/api/v1/users/login", json=credentials)
+    assert response.status_code == 429
+    assert response.json()["detail"] == "Too many login attempts"
+    assert int(response.headers["retry-after"]) >= 1
+    # Rejeitado antes de consultar o banco (e, portanto, do bcrypt)
+    assert response.headers["server-timing"].startswith('db;desc="0 queries";')
+
+    # Outro usuário tem o próprio balde
+    response = client.post(
+        "/api/v1/users/login", json={"username": "other", "password": "x"}
+    )
+    assert response.status_code == 401
+    assert login_limiter.stats()["rejected"] == 1
+
+
+def test_login_throttled_per_ip(client: TestClient, monkeypatch):
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_PER_IP", 2)
+    for i in range(2):
+        response = client.post(
+            "/api/v1/users/login", json={"username": f"u{i}", "password": "x"}
+        )
+        assert response.status_code == 401
+    response = client.post(
+        "/api/v1/users/login", json={"username": "u3", "password": "x"}
+    )
+    assert response.status_code == 429
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refills(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(
+        "hermanitto_docs_api.core.rate_limit.time.monotonic", lambda: now[0]
+    )
+    limiter = RateLimiter(MemoryRateLimitBackend(max_keys=10))
+    # 6 por minuto: rajada de 6, depois um token a cada 10 s
+    assert [await limiter.check("k", 6) for _ in range(6)] == [0.0] * 6
+    assert await limiter.check("k", 6) == pytest.approx(10.0)
+    now[0] += 10
+    assert await limiter.check("k", 6) == 0.0
+    assert await limiter.check("k", 0) == 0.0
+    assert limiter.stats() == {
+        "allowed": 7,
+        "rejected": 1,
+        "backend_errors": 0,
+        "keys": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_fails_open():
+    class BrokenBackend(MemoryRateLimitBackend):
+        async def take(self, key, capacity, per_second):
+            raise ConnectionError("backend down")
+
+    limiter = RateLimiter(BrokenBackend(max_keys=10))
+    assert await limiter.check("k", 1) == 0.0
+    assert limiter.stats()["backend_errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_register_is_a_single_statement(
+    async_client: AsyncClient, statements
+):
+    response = await async_client.post(
+        "/api/v1/users/register",
+        json={"username": "testuser", "password": "testpass"},
+    )
+    assert response.status_code == 200
+    assert response.json()["created_at"]
+    # INSERT ... RETURNING, sem SELECT de refresh
+    assert statements(response) == 1
@@ -1,3 +1,4 @@
+import re
 import pytest
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import (
@@ -9,7 +10,18 @@ from fastapi.testclient import TestClient
 
 from hermanitto_docs_api.main import app
 from hermanitto_docs_api.models.base import Base
-from hermanitto_docs_api.core.dependencies import get_db
+from hermanitto_docs_api.core.dependencies import (
+    enable_sqlite_foreign_keys,
+    get_db,
+    get_read_db,
+    get_session_factory,
+)
+from hermanitto_docs_api.core.query_stats import instrument_engine
+from hermanitto_docs_api.core.rate_limit import login_limiter
+from hermanitto_docs_api.core.response_cache import response_cache
+from hermanitto_docs_api.core.security import token_cache
+from hermanitto_docs_api.services.type_cache import type_cache
+from hermanitto_docs_api.services.user_service import user_cache
 
 # Use SQLite for testing
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -18,6 +30,9 @@ engine = create_async_engine(
     TEST_DATABASE_URL, echo=True, connect_args={"check_same_thread": False}
 )
 
+instrument_engine(engine)
+enable_sqlite_foreign_keys(engine)
+
 TestingSessionLocal = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
@@ -27,6 +42,11 @@ TestingSessionLocal = async_sessionmaker(
 @pytest.mark.asyncio
 async def db_session():
     """Create a clean database on each test case."""
+    type_cache.invalidate()
+    token_cache.clear()
+    user_cache.clear()
+    await login_limiter.reset()
+    await response_cache.reset()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
@@ -48,6 +68,23 @@ async def override_get_db():
 
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_read_db] = override_get_db
+app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+
+
+@pytest.fixture
+def statements():
+    """Return a function counting the SQL statements a response ran.
+
+    Reads the Server-Timing header, so budgets such as "one INSERT per
+    create" can be asserted per endpoint.
+    """
+
+    def count(response) -> int:
+        timing = response.headers["server-timing"]
+        return int(re.search(r'desc="(\d+) queries"', timing).group(1))
+
+    return count
 
 
 @pytest.fixture